@@ -13,10 +13,27 @@ A simple wrapper around Base16 colorschemes.
 
 import re
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from ansilog import bg
 
+XDEFAULTS_FILE = Path.home() / ".Xdefaults"
+
+
+# --------------------------------------------------------------------
+class Color(str):
+    """
+    A color taken from a Base16 slot, which remembers its slot so that it
+    can be replaced when the colorscheme changes.
+    """
+
+    slot: int
+
+    def __new__(cls, value: str, slot: int):
+        color = super().__new__(cls, value)
+        color.slot = slot
+        return color
+
 
 # --------------------------------------------------------------------
 class Base16:
@@ -24,9 +41,7 @@ class Base16:
         self.base16colors = base16colors
 
     @classmethod
-    def load_from_xdefaults(cls):
-        xdefaults_file = Path.home() / ".Xdefaults"
-
+    def parse_xdefaults(cls, xdefaults_file: Path = XDEFAULTS_FILE) -> List[str]:
         base16 = list([''] * 16)
 
         with open(xdefaults_file, "r") as infile:
@@ -38,12 +53,30 @@ class Base16:
         if any(v == '' for v in base16):
             raise ValueError('Failed to parse base16 colorscheme from ~/.Xdefaults.')
 
-        return Base16(base16)
+        return base16
+
+    @classmethod
+    def load_from_xdefaults(cls):
+        return Base16(cls.parse_xdefaults())
+
+    def reload(self, xdefaults_file: Path = XDEFAULTS_FILE) -> Dict[int, str]:
+        """
+        Reload the colorscheme in place, and return a map from each slot
+        whose color changed to its new color.
+        """
+        base16 = self.parse_xdefaults(xdefaults_file)
+        changes = {
+            slot: new
+            for slot, (old, new) in enumerate(zip(self.base16colors, base16))
+            if old != new
+        }
+        self.base16colors[:] = base16
+        return changes
 
     def get(self, n):
         if n < 0 or n > 0x10:
             raise ValueError('Value must be between 0 and 15.')
-        return self.base16colors[n]
+        return Color(self.base16colors[n], n)
 
     def __call__(self, n):
         return self.get(n)
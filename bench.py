@@ -0,0 +1,350 @@
+# --------------------------------------------------------------------
+# bench.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Benchmarks for the config's hot paths.
+
+Qtile, windows, netifaces, and iwlib are replaced with stubs so that the
+benchmarks can run outside of a qtile session and measure only our own
+code.  Each result is recorded as a multiple of the time taken by a fixed
+calibration workload, and compared against `bench_baseline.json`.  The run
+fails if any benchmark is slower than its baseline by more than the
+threshold.
+
+Usage:
+    python bench.py              # Compare against the baseline.
+    python bench.py --update     # Record a new baseline.
+"""
+
+import argparse
+import json
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Callable
+
+BASELINE_FILE = Path(__file__).parent / "bench_baseline.json"
+
+
+# --------------------------------------------------------------------
+class Stub:
+    """
+    An object which accepts any attribute access or call.
+    """
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+    def __getattr__(self, name):
+        return Stub()
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+
+# --------------------------------------------------------------------
+class StubTextBox:
+    defaults: list = []
+
+    def __init__(self, text="", **config):
+        self.name = type(self).__name__.lower()
+        self.text = text
+        self.__dict__.update(config)
+
+    def add_defaults(self, defaults):
+        for name, value, _ in defaults:
+            if name not in self.__dict__:
+                setattr(self, name, value)
+
+    def can_draw(self):
+        return False
+
+    def update(self, text):
+        self.text = text
+
+    def finalize(self):
+        pass
+
+
+# --------------------------------------------------------------------
+class StubInLoopPollText(StubTextBox):
+    defaults = [("update_interval", 600, "")]
+
+    def __init__(self, default_text="N/A", **config):
+        super().__init__(default_text, **config)
+        self.add_defaults(StubInLoopPollText.defaults)
+
+
+# --------------------------------------------------------------------
+class StubScreen:
+    def __init__(self, x=0, y=0, width=2560, height=1440):
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+
+# --------------------------------------------------------------------
+class StubWindow:
+    def __init__(self):
+        self.x, self.y, self.width, self.height = 0, 0, 0, 0
+        self.floating = False
+        self.minimized = False
+        self.opacity = 1.0
+
+    def cmd_set_size_floating(self, w, h):
+        self.floating = True
+        self.width, self.height = w, h
+
+    def cmd_set_position_floating(self, x, y):
+        self.floating = True
+        self.x, self.y = x, y
+
+    def cmd_bring_to_front(self):
+        pass
+
+
+# --------------------------------------------------------------------
+def install_stubs():
+    def module(name, **attrs):
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        sys.modules[name] = mod
+        return mod
+
+    hook = Stub()
+    libqtile = module("libqtile", hook=hook, qtile=Stub(), bar=Stub(), widget=Stub())
+    module("libqtile.hook")
+    module("libqtile.bar", Bar=object)
+    module("libqtile.config", Group=object, Match=object)
+    module("libqtile.backend")
+    module("libqtile.backend.base", Window=StubWindow)
+    module("libqtile.core")
+    module("libqtile.core.manager", Qtile=object)
+    module("libqtile.log_utils", logger=Stub())
+    module("libqtile.widget")
+    module(
+        "libqtile.widget.base",
+        ORIENTATION_HORIZONTAL=1,
+        InLoopPollText=StubInLoopPollText,
+        _TextBox=StubTextBox,
+    )
+    libqtile.widget = sys.modules["libqtile.widget"]
+    libqtile.widget.Clock = StubInLoopPollText
+
+    ifaces = ["lo", "enp3s0", "wlp2s0"]
+    module(
+        "netifaces",
+        AF_INET=2,
+        interfaces=lambda: ifaces,
+        ifaddresses=lambda iface: {2: [{"addr": "192.168.1.%d" % len(iface)}]},
+    )
+    module(
+        "iwlib",
+        get_iwconfig=lambda iface: {"ESSID": b"network", "stats": {"quality": 60}},
+    )
+    module("psutil", virtual_memory=lambda: Stub(used=4, total=16))
+
+
+# --------------------------------------------------------------------
+def measure(f: Callable[[], object], min_sec=1.0, repeat=15) -> float:
+    """
+    Measure the best time per call of `f` in nanoseconds.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            f()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_sec * 1e9 / repeat:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            f()
+        best = min(best, (time.perf_counter_ns() - start) / loops)
+    return best
+
+
+# --------------------------------------------------------------------
+def calibration():
+    """
+    A fixed pure-Python workload.  It is timed before each benchmark, and
+    results are stored relative to it so that they can be compared across
+    machines and aren't skewed by the machine being busy.
+    """
+    total = 0
+    for n in range(100):
+        total += n * n
+    return total
+
+
+# --------------------------------------------------------------------
+def bench_status_update():
+    import timeutil
+    from status import Status
+
+    # Freeze the clock so that every update does the same work.
+    timeutil.set_clock(timeutil.FakeClock())
+    for n in range(8):
+        Status.show(f"subject{n}", f"message {n}", display_sec=3600)
+    return Status.update
+
+
+# --------------------------------------------------------------------
+def bench_status_show():
+    from status import Status
+
+    return lambda: Status.show("volume", "50%")
+
+
+# --------------------------------------------------------------------
+def bench_position_media_window():
+    from media import MediaContainer
+
+    qtile = Stub(current_screen=StubScreen())
+    MediaContainer.window = StubWindow()
+    return lambda: MediaContainer.position_media_window(qtile)
+
+
+# --------------------------------------------------------------------
+def bench_resolution_by_aspect_ratio():
+    from media import Resolution
+
+    return lambda: list(Resolution.by_aspect_ratio(16, 9))
+
+
+# --------------------------------------------------------------------
+def bench_network_poll():
+    from widget import CustomNetwork
+
+    network = CustomNetwork(use_netlink=False)
+
+    def poll():
+        network.on_query(network.events, network.query(True, True))
+        return network.format()
+
+    return poll
+
+
+# --------------------------------------------------------------------
+def bench_framework_inject():
+    """
+    Resolve a provider graph shaped like the one in `config.py`, measuring
+    the framework's own overhead.
+    """
+    from xeno import SyncInjector
+
+    import framework
+
+    injector = SyncInjector()
+
+    def provide(f, *attrs):
+        for attr in attrs:
+            framework.MethodAttributes.for_method(f, write=True).put(attr)
+        injector.provide(framework.timed(f))
+
+    def num_screens():
+        return 2
+
+    def font_info():
+        return {"font": "mono", "info": "sans", "size": 12}
+
+    def base16():
+        return [f"{n:06x}" for n in range(16)]
+
+    def widget_defaults(font_info, base16):
+        return dict(font=font_info["font"], background=base16[0])
+
+    def keys(widget_defaults):
+        return list(range(100))
+
+    def screens(num_screens, widget_defaults, font_info, base16):
+        return [dict(widget_defaults) for _ in range(num_screens)]
+
+    def other_settings():
+        return {"auto_fullscreen": True}
+
+    def setup_hooks(base16):
+        pass
+
+    for f in (num_screens, font_info, base16):
+        provide(f)
+    for f in (widget_defaults, keys, screens):
+        provide(f, "qtile_config")
+    provide(other_settings, "qtile_config_set")
+    provide(setup_hooks, "qtile_setup")
+
+    framework.logger = Stub()
+    return lambda: framework.inject({}, injector, timings_file=None)
+
+
+# --------------------------------------------------------------------
+BENCHMARKS = {
+    "status_update": bench_status_update,
+    "status_show": bench_status_show,
+    "position_media_window": bench_position_media_window,
+    "resolution_by_aspect_ratio": bench_resolution_by_aspect_ratio,
+    "network_poll": bench_network_poll,
+    "framework_inject": bench_framework_inject,
+}
+
+
+# --------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="Record a new baseline.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="Fail if a benchmark is slower than this multiple of its baseline.",
+    )
+    parser.add_argument("names", nargs="*", help="Benchmarks to run, default all.")
+    args = parser.parse_args()
+
+    install_stubs()
+
+    try:
+        with open(BASELINE_FILE, "r") as infile:
+            baseline = json.load(infile)
+    except FileNotFoundError:
+        baseline = {}
+
+    results = {}
+    regressions = []
+    for name in args.names or BENCHMARKS:
+        f = BENCHMARKS[name]()
+        calibration_ns = measure(calibration, min_sec=0.25)
+        ns = measure(f)
+        results[name] = cost = ns / calibration_ns
+        line = f"{name:32} {ns / 1000:12.2f}us {cost:10.4f}"
+        if name in baseline:
+            ratio = cost / baseline[name]
+            line += f"  {ratio:5.2f}x baseline"
+            if ratio > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.update:
+        with open(BASELINE_FILE, "w") as outfile:
+            results = {k: round(v, 4) for k, v in results.items()}
+            json.dump({**baseline, **results}, outfile, indent=4, sort_keys=True)
+            outfile.write("\n")
+        return 0
+
+    return 1 if regressions else 0
+
+
+# --------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(main())
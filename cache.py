@@ -0,0 +1,194 @@
+# --------------------------------------------------------------------
+# cache.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+An on-disk cache of provider values which persists across qtile restarts.
+
+Each entry is keyed by the state of the files the provider reads and by an
+optional fingerprint of the hardware it queries.  Files are compared by
+mtime and size first, and only hashed when those have changed.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from libqtile.log_utils import logger
+
+CACHE_FILE = Path.home() / ".cache" / "qtile" / "providers.json"
+
+
+# --------------------------------------------------------------------
+def file_digest(path: Path) -> str:
+    with open(path, "rb") as infile:
+        return hashlib.sha256(infile.read()).hexdigest()
+
+
+# --------------------------------------------------------------------
+class ProviderCache:
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.loaded = False
+        self.dirty = False
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+        self.lock = threading.RLock()
+
+    def load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            try:
+                with open(self.path, "r") as infile:
+                    self.entries = json.load(infile)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable provider cache: %s", self.path)
+
+    def save(self):
+        """
+        Write the cache back to disk if any entries have changed, and log
+        the hits and misses since the last save.
+        """
+        with self.lock:
+            logger.info(
+                "provider cache: %d hit(s) [%s], %d miss(es) [%s]",
+                len(self.hits),
+                ",".join(self.hits),
+                len(self.misses),
+                ",".join(self.misses),
+            )
+            self.hits.clear()
+            self.misses.clear()
+
+            if not self.dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                with open(tmp_path, "w") as outfile:
+                    json.dump(self.entries, outfile)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                logger.exception("Failed to write provider cache: %s", self.path)
+
+    def file_keys(self, files: Iterable[Path], old_keys: list[dict]) -> Optional[list[dict]]:
+        """
+        Build the keys for the given input files, reusing the digests from
+        `old_keys` for files whose mtime and size haven't changed.  Returns
+        None if any of the files can't be read.
+        """
+        old = {k["path"]: k for k in old_keys}
+        keys = []
+        for path in files:
+            try:
+                stat = path.stat()
+                key = {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                prev = old.get(key["path"])
+                if prev and (prev["mtime_ns"], prev["size"]) == (key["mtime_ns"], key["size"]):
+                    key["sha256"] = prev["sha256"]
+                else:
+                    key["sha256"] = file_digest(path)
+            except OSError:
+                return None
+            keys.append(key)
+        return keys
+
+    def get(
+        self,
+        name: str,
+        compute: Callable[[], Any],
+        files: Iterable[Path] = (),
+        fingerprint: Optional[Callable[[], Any]] = None,
+        encode: Callable[[Any], Any] = lambda v: v,
+        decode: Callable[[Any], Any] = lambda v: v,
+    ) -> Any:
+        """
+        Get the cached value for `name`, or compute and cache it if any of
+        its inputs have changed.  A fingerprint of None means the inputs
+        can't be determined, and the value is always recomputed.
+        """
+        self.load()
+        with self.lock:
+            entry = self.entries.get(name, {})
+
+        keys = self.file_keys(files, entry.get("files", []))
+        fp = fingerprint() if fingerprint is not None else []
+        cacheable = keys is not None and fp is not None
+        hashes = [k["sha256"] for k in keys or []]
+
+        if (
+            cacheable
+            and "value" in entry
+            and [k["sha256"] for k in entry.get("files", [])] == hashes
+            and entry.get("fingerprint") == fp
+        ):
+            with self.lock:
+                self.hits.append(name)
+                if entry["files"] != keys:
+                    entry["files"] = keys
+                    self.dirty = True
+            return decode(copy.deepcopy(entry["value"]))
+
+        value = compute()
+        with self.lock:
+            self.misses.append(name)
+            if cacheable:
+                self.entries[name] = {
+                    "files": keys,
+                    "fingerprint": fp,
+                    "value": copy.deepcopy(encode(value)),
+                }
+                self.dirty = True
+        return value
+
+
+# --------------------------------------------------------------------
+provider_cache = ProviderCache()
+
+
+# --------------------------------------------------------------------
+def cached(
+    files: Iterable[Path] = (),
+    fingerprint: Optional[Callable[[], Any]] = None,
+    encode: Callable[[Any], Any] = lambda v: v,
+    decode: Callable[[Any], Any] = lambda v: v,
+    cache: ProviderCache = provider_cache,
+):
+    """
+    Cache the value of a provider on disk, keyed by the given input files
+    and hardware fingerprint.  The provider's value must depend only on
+    these inputs, and `encode` must produce a JSON serializable value.
+    """
+    files = list(files)
+
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            return cache.get(
+                f.__name__,
+                lambda: f(*args, **kwargs),
+                files,
+                fingerprint,
+                encode,
+                decode,
+            )
+
+        return wrapper
+
+    return decorator
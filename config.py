@@ -24,18 +24,38 @@ from libqtile.config import Click, Drag, Group, Key, Match, Screen
 from libqtile.core.manager import Qtile
 from libqtile.lazy import lazy
 
-from base16 import Base16
+import hardware
+from base16 import XDEFAULTS_FILE, Base16
+from cache import cached, provider_cache
 from constants import FONT_SCALING_RATIO, Subjects
 from framework import config, config_set, inject, provide, setup
+from hotplug import Hotplug
 from media import MediaContainer
+from palette import PaletteWatcher
+from rules import RuleIndex
+from screengraph import ScreenGraph
 from status import Status
+from status_socket import StatusSocket
+from tracking import FloatIndex, TiledMRU
+from visibility import Visibility
 from util import (
     adjust_opacity,
     ground_all_floats,
     window_to_next_screen,
     window_to_prev_screen,
+    window_to_screen,
 )
-from widget import CustomMemory, CustomNetwork, FastGenPollText
+from widget import (
+    CustomBattery,
+    CustomClock,
+    CustomCPU,
+    CustomMemory,
+    CustomNetwork,
+    StatusText,
+)
+
+
+FONT_CONFIG_FILE = Path.home() / ".font" / "config.json"
 
 
 # -------------------------------------------------------------------
@@ -44,8 +64,7 @@ def util(cmd: str) -> str:
 
 
 # -------------------------------------------------------------------
-@provide
-def num_screens() -> int:
+def xrandr_num_screens() -> int:
     return int(
         subprocess.check_output(
             'xrandr | grep " connected " | wc -l', shell=True
@@ -53,10 +72,30 @@ def num_screens() -> int:
     )
 
 
+# -------------------------------------------------------------------
+def upower_num_batteries() -> int:
+    return int(
+        subprocess.check_output("upower -e | grep BAT | wc -l", shell=True).decode(
+            "utf-8"
+        )
+    )
+
+
 # -------------------------------------------------------------------
 @provide
+def num_screens() -> int:
+    outputs = hardware.connected_outputs()
+    # Some drivers don't report connector status through DRM.
+    if not outputs:
+        return xrandr_num_screens()
+    return len(outputs)
+
+
+# -------------------------------------------------------------------
+@provide
+@cached(files=[FONT_CONFIG_FILE])
 def font_info() -> dict:
-    with open(Path.home() / ".font/config.json", "r") as infile:
+    with open(FONT_CONFIG_FILE, "r") as infile:
         info = json.load(infile)
         info["original"] = info["font"]
         info["info"] = "Overpass"
@@ -66,6 +105,7 @@ def font_info() -> dict:
 
 # -------------------------------------------------------------------
 @provide
+@cached(files=[XDEFAULTS_FILE], encode=lambda b: b.base16colors, decode=Base16)
 def base16() -> Base16:
     return Base16.load_from_xdefaults()
 
@@ -106,6 +146,10 @@ def keys(mod, groups) -> List[Key]:
         Key([mod, "shift", "control"], "v", lazy.function(MediaContainer.focus_media)),
         Key([mod, "shift"], "v", lazy.function(MediaContainer.toggle_media)),
         Key([mod, "shift"], "w", lazy.function(window_to_prev_screen)),
+        Key([mod, "shift", "control"], "h", lazy.function(window_to_screen("left"))),
+        Key([mod, "shift", "control"], "j", lazy.function(window_to_screen("down"))),
+        Key([mod, "shift", "control"], "k", lazy.function(window_to_screen("up"))),
+        Key([mod, "shift", "control"], "l", lazy.function(window_to_screen("right"))),
         Key([mod], "b", lazy.function(adjust_opacity(0.01))),
         Key([mod, "shift"], "b", lazy.function(adjust_opacity(-0.01))),
         # --> Media window controls
@@ -252,38 +296,40 @@ def sep_factory(base16: Base16) -> Callable[[], widget.Sep]:
 # -------------------------------------------------------------------
 @provide
 def num_batteries() -> int:
-    return int(
-        subprocess.check_output("upower -e | grep BAT | wc -l", shell=True).decode(
-            "utf-8"
-        )
-    )
+    batteries = hardware.batteries()
+    if batteries is None:
+        return upower_num_batteries()
+    return len(batteries)
 
 
 # -------------------------------------------------------------------
 @provide
-def battery_widgets(font_info, num_batteries) -> list[widget.Battery]:
-    scaled_fontsize = int(font_info["size"] * FONT_SCALING_RATIO)
-    widgets = []
-    for battery_id in range(num_batteries):
-        prefix = ""
-        suffix = ""
-        if num_batteries > 1:
-            prefix = f"{chr(ord('A') + battery_id)}"
-        if battery_id < num_batteries - 1:
-            suffix = " "
-        widgets.append(
-            widget.Battery(
-                battery=battery_id,
-                format=prefix + "{char}{percent:2.0%}" + suffix,
-                charge_char="+",
-                discharge_char="-",
-                empty_char="!",
-                show_short_text=False,
-                font=font_info["font"],
-                fontsize=scaled_fontsize
+def battery_widgets_factory(font_info, num_batteries) -> Callable[[], list[CustomBattery]]:
+    def factory():
+        scaled_fontsize = int(font_info["size"] * FONT_SCALING_RATIO)
+        widgets = []
+        for battery_id in range(num_batteries):
+            prefix = ""
+            suffix = ""
+            if num_batteries > 1:
+                prefix = f"{chr(ord('A') + battery_id)}"
+            if battery_id < num_batteries - 1:
+                suffix = " "
+            widgets.append(
+                CustomBattery(
+                    battery=battery_id,
+                    format=prefix + "{char}{percent:2.0%}" + suffix,
+                    charge_char="+",
+                    discharge_char="-",
+                    empty_char="!",
+                    show_short_text=False,
+                    font=font_info["font"],
+                    fontsize=scaled_fontsize
+                )
             )
-        )
-    return widgets
+        return widgets
+
+    return factory
 
 
 # -------------------------------------------------------------------
@@ -312,7 +358,7 @@ def screens(
     base16: Base16,
     num_screens,
     widget_defaults,
-    battery_widgets,
+    battery_widgets_factory,
     group_box_factory,
     sep_factory,
     font_info,
@@ -321,6 +367,37 @@ def screens(
     bar_height = scaled_fontsize + 16
     MediaContainer.bar_height = bar_height
 
+    # Widgets backed by a data source are created once and shared by every
+    # bar.  Qtile mirrors a widget onto each additional bar it is added to,
+    # so each source is polled and rendered once regardless of num_screens.
+    status_widgets = [
+        StatusText(fontsize=scaled_fontsize),
+        sep_factory(),
+        CustomNetwork(
+            font=font_info["info"],
+            fontsize=scaled_fontsize,
+            foreground=base16(0x03),
+        ),
+        sep_factory(),
+        CustomMemory(fontsize=scaled_fontsize, foreground=base16(0x03)),
+        CustomCPU(
+            format="@{load_percent:02.0f}% ",
+            fontsize=scaled_fontsize,
+            foreground=base16(0x03),
+        ),
+        *battery_widgets_factory(),
+        sep_factory(),
+        CustomClock(
+            format="%a ", fontsize=scaled_fontsize, foreground=base16(0x03)
+        ),
+        CustomClock(
+            format="%m/%d/%Y ",
+            fontsize=scaled_fontsize,
+            foreground=base16(0x03),
+        ),
+        CustomClock(format="%H:%M:%S"),
+    ]
+
     return [
         Screen(
             top=bar.Bar(
@@ -334,35 +411,7 @@ def screens(
                         fontsize=scaled_fontsize,
                     ),
                     sep_factory(),
-                    FastGenPollText(
-                        func=Status.update,
-                        update_interval=Status.update_sec,
-                        fontsize=scaled_fontsize,
-                    ),
-                    sep_factory(),
-                    CustomNetwork(
-                        font=font_info["info"],
-                        fontsize=scaled_fontsize,
-                        foreground=base16(0x03),
-                    ),
-                    sep_factory(),
-                    CustomMemory(fontsize=scaled_fontsize, foreground=base16(0x03)),
-                    widget.CPU(
-                        format="@{load_percent:02.0f}% ",
-                        fontsize=scaled_fontsize,
-                        foreground=base16(0x03),
-                    ),
-                    *battery_widgets,
-                    sep_factory(),
-                    widget.Clock(
-                        format="%a ", fontsize=scaled_fontsize, foreground=base16(0x03)
-                    ),
-                    widget.Clock(
-                        format="%m/%d/%Y ",
-                        fontsize=scaled_fontsize,
-                        foreground=base16(0x03),
-                    ),
-                    widget.Clock(format="%H:%M:%S"),
+                    *status_widgets,
                 ],
                 size=bar_height,
                 **widget_defaults,
@@ -373,10 +422,12 @@ def screens(
 
 
 # -------------------------------------------------------------------
-@config
-def floating_layout():
-    return layout.Floating(
-        float_rules=[
+@provide
+def window_rules() -> RuleIndex:
+    rules = RuleIndex()
+    rules.add(
+        "float",
+        [
             *layout.Floating.default_float_rules,
             # Run the utility of `xprop` to see the wm class and name of an X client.
             *[
@@ -397,6 +448,17 @@ def floating_layout():
             ],
             Match(title="pinentry"),
         ],
+    )
+    # Automatically make mpv windows the media window.
+    rules.add("media", [Match(wm_class="mpv")])
+    return rules
+
+
+# -------------------------------------------------------------------
+@config
+def floating_layout(window_rules: RuleIndex):
+    return layout.Floating(
+        float_rules=[window_rules.rule("float")],
         border_width=0,
     )
 
@@ -413,14 +475,24 @@ def other_settings():
         "focus_on_window_activation": "smart",
         "follow_mouse_focus": False,
         "main": None,
+        # Screen changes are applied by `Hotplug`, which rebuilds the bars
+        # and falls back to qtile's reconfiguration if that fails.
+        "reconfigure_screens": False,
         "wmname": "LG3D",
     }
 
 
 # -------------------------------------------------------------------
 @setup
-def setup_hooks():
+def setup_hooks(base16: Base16, window_rules: RuleIndex):
     MediaContainer.setup_hooks()
+    PaletteWatcher.setup_hooks(base16)
+    Visibility.setup_hooks()
+    StatusSocket.setup_hooks()
+    FloatIndex.setup_hooks()
+    TiledMRU.setup_hooks()
+    ScreenGraph.setup_hooks()
+    Hotplug.setup_hooks()
 
     @hook.subscribe.startup_once
     def autostart():
@@ -428,9 +500,7 @@ def setup_hooks():
 
     @hook.subscribe.client_new
     def floating_dialogs(window):
-        # Automatically make mpv windows the media window.
-        auto_media_rules = [Match(wm_class="mpv")]
-        if any(window.match(rule) for rule in auto_media_rules):
+        if window_rules.matches(window, "media"):
             MediaContainer.set_media(qtile, window)
             qtile.call_later(0, MediaContainer.position_media_window, qtile)
 
@@ -446,11 +516,11 @@ def setup_hooks():
     @hook.subscribe.setgroup
     def on_group_changed():
         assert isinstance(qtile, Qtile)
-        if qtile.current_group.name == "9":
-            qtile.current_screen.top.show(False)
-        else:
-            qtile.current_screen.top.show(True)
+        Visibility.show_bar(
+            qtile, qtile.current_screen.top, qtile.current_group.name != "9"
+        )
 
 
 # -------------------------------------------------------------------
 inject(globals())
+provider_cache.save()
@@ -0,0 +1,46 @@
+# --------------------------------------------------------------------
+# frames.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Coalesces bursts of key-repeat actions into at most one update per
+display frame.
+"""
+
+from typing import Callable, Dict
+
+from libqtile.core.manager import Qtile
+
+FRAME_SEC = 1 / 60
+
+Deltas = Dict[str, float]
+
+
+# --------------------------------------------------------------------
+class FrameAccumulator:
+    """
+    Collects named deltas and passes their sums to `apply` once per frame,
+    on the first frame after a delta is added.
+    """
+
+    def __init__(self, apply: Callable[[Qtile, Deltas], None], frame_sec: float = FRAME_SEC):
+        self.apply = apply
+        self.frame_sec = frame_sec
+        self.deltas: Deltas = {}
+        self.timer = None
+
+    def add(self, qtile: Qtile, name: str, delta: float):
+        self.deltas[name] = self.deltas.get(name, 0) + delta
+        if self.timer is None:
+            self.timer = qtile.call_later(self.frame_sec, self.flush, qtile)
+
+    def flush(self, qtile: Qtile):
+        self.timer = None
+        deltas, self.deltas = self.deltas, {}
+        if any(deltas.values()):
+            self.apply(qtile, deltas)
@@ -13,13 +13,131 @@ defined as functions and injected into the config namespace
 after dependency resolution.
 """
 
-from typing import Set
-from xeno import MethodAttributes, SyncInjector
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional, Set
+
+from libqtile.log_utils import logger
+from xeno import MethodAttributes, SyncInjector, Tags
+
+
+# -------------------------------------------------------------------
+@dataclass
+class ResourceTiming:
+    name: str
+    calls: int = 0
+    total_ms: float = 0.0
+    depth: int = 0
+    dependencies: list[str] = field(default_factory=list)
+    dependents: list[str] = field(default_factory=list)
+
+
+# -------------------------------------------------------------------
+class Timings:
+    """
+    Records the wall time spent in each provider, not including the time
+    spent resolving its dependencies.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: dict[str, list[float]] = {}
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def record(self, name: str, sec: float):
+        with self.lock:
+            self.samples.setdefault(name, []).append(sec)
+
+    def report(self, injector: SyncInjector) -> list[ResourceTiming]:
+        """
+        Build a report of the recorded timings, slowest first.  Each entry
+        includes the resource's depth in the dependency graph (0 for
+        resources with no dependencies) and its direct neighbours.
+        """
+        graph = {name: list(injector.get_dependencies(name)) for name in injector.resources}
+        dependents: dict[str, list[str]] = {}
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents.setdefault(dep, []).append(name)
+
+        depths: dict[str, int] = {}
+
+        def depth(name: str) -> int:
+            if name not in depths:
+                depths[name] = 1 + max((depth(d) for d in graph.get(name, [])), default=-1)
+            return depths[name]
+
+        with self.lock:
+            samples = {k: list(v) for k, v in self.samples.items()}
+
+        report = [
+            ResourceTiming(
+                name=name,
+                calls=len(secs),
+                total_ms=sum(secs) * 1000,
+                depth=depth(name),
+                dependencies=sorted(graph.get(name, [])),
+                dependents=sorted(dependents.get(name, [])),
+            )
+            for name, secs in samples.items()
+        ]
+        report.sort(key=lambda t: t.total_ms, reverse=True)
+        return report
+
+    def log_report(self, injector: SyncInjector):
+        for t in self.report(injector):
+            logger.info(
+                "provider %s: %.2fms in %d call(s), depth %d, deps=%s",
+                t.name,
+                t.total_ms,
+                t.calls,
+                t.depth,
+                ",".join(t.dependencies) or "-",
+            )
+
+    def write_report(self, injector: SyncInjector, path: Path):
+        with open(path, "w") as outfile:
+            json.dump([asdict(t) for t in self.report(injector)], outfile, indent=4)
 
 
 # -------------------------------------------------------------------
 injector = SyncInjector()
-provide = injector.provide
+timings = Timings()
+
+# The values resolved by the last `inject()` or `refresh()`, per injector.
+resolved_values: dict[SyncInjector, dict[str, Any]] = {}
+
+
+# -------------------------------------------------------------------
+def timed(f):
+    """
+    Wrap a provider so that the time spent in it is recorded in `timings`.
+    """
+    name = MethodAttributes.for_method(f).get(Tags.NAME, f.__name__)
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            timings.record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+# -------------------------------------------------------------------
+def provide(f):
+    return injector.provide(timed(f))
 
 
 # -------------------------------------------------------------------
@@ -51,14 +169,201 @@ def _scan(injector: SyncInjector, target_attr: str) -> Set[str]:
 
 
 # -------------------------------------------------------------------
-def inject(namespace: dict, injector: SyncInjector = injector):
-    for key in _scan(injector, "qtile_config"):
-        namespace[key] = injector.require(key)
+def dependency_graph(names: Iterable[str], injector: SyncInjector = injector) -> dict[str, Set[str]]:
+    """
+    Get the direct dependencies of the given resources and of all of their
+    dependencies, directly or indirectly.
+    """
+    graph: dict[str, Set[str]] = {}
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in graph:
+            graph[name] = set(injector.get_dependencies(name))
+            stack.extend(graph[name])
+    return graph
+
+
+# -------------------------------------------------------------------
+def resolve(
+    names: Iterable[str],
+    injector: SyncInjector = injector,
+    max_workers: Optional[int] = None,
+    concurrent: bool = True,
+) -> dict[str, Any]:
+    """
+    Resolve the given resources and all of their dependencies, running
+    providers on a thread pool as soon as their dependencies are available
+    so that independent branches of the dependency graph are evaluated
+    concurrently.  If `concurrent` is False, the providers are instead run
+    one at a time in the calling thread.
+
+    Each resource is evaluated once, and its value is held as a singleton in
+    the injector so that its dependents receive the same value.  Use
+    `release()` to drop these values when they are no longer needed.
+    """
+    pending = dependency_graph(names, injector)
+    results: dict[str, Any] = {}
+
+    def take_ready() -> list[str]:
+        ready = [k for k, deps in pending.items() if not deps]
+        for name in ready:
+            del pending[name]
+        return ready
+
+    def complete(name: str, value: Any):
+        results[name] = injector.singletons[name] = value
+        for deps in pending.values():
+            deps.discard(name)
+
+    if not concurrent:
+        while ready := take_ready():
+            for name in ready:
+                complete(name, injector.require(name))
+        return results
+
+    futures: dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def submit_ready():
+            for name in take_ready():
+                futures[pool.submit(injector.require, name)] = name
+
+        submit_ready()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                complete(futures.pop(future), future.result())
+            submit_ready()
+
+    return results
+
+
+# -------------------------------------------------------------------
+def release(names: Iterable[str], injector: SyncInjector = injector):
+    """
+    Drop values held by `resolve()` for resources that aren't singletons.
+    """
+    for name in names:
+        attrs = injector.resource_attrs.get(name)
+        if attrs is None or not attrs.check(Tags.SINGLETON):
+            injector.singletons.pop(name, None)
+
+
+# -------------------------------------------------------------------
+def dependents(names: Iterable[str], injector: SyncInjector = injector) -> Set[str]:
+    """
+    Get the given resources and every resource which depends on them,
+    directly or indirectly.
+    """
+    reverse: dict[str, Set[str]] = {}
+    for name in injector.resources:
+        for dep in injector.get_dependencies(name):
+            reverse.setdefault(dep, set()).add(name)
+
+    result: Set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in result:
+            result.add(name)
+            stack.extend(reverse.get(name, ()))
+    return result
+
+
+# -------------------------------------------------------------------
+def refresh(
+    names: Iterable[str],
+    injector: SyncInjector = injector,
+    concurrent: bool = True,
+) -> dict[str, Any]:
+    """
+    Re-run the given resources, and if any of their values changed since
+    the last `inject()`, re-run every config resource which depends on
+    them.  All other resources keep their previously resolved values, and
+    setup resources are never re-run.  See `resolve()` for `concurrent`.
+
+    Returns the new values of the resources which were re-run, or an empty
+    dict if none of the given resources changed.
+    """
+    names = set(names)
+    values = resolved_values.setdefault(injector, {})
+    setup_keys = _scan(injector, "qtile_setup")
+
+    # Seed the injector with the previous values of everything that won't
+    # be re-run, so that only the affected resources are evaluated.
+    affected = dependents(names, injector)
+    seeded = {k for k in values if k not in affected and k not in injector.singletons}
+    for key in seeded:
+        injector.singletons[key] = values[key]
+    for key in affected:
+        injector.singletons.pop(key, None)
+
+    results: dict[str, Any] = {}
+    try:
+        roots = resolve(names, injector, concurrent=concurrent)
+        changed = {k for k in names if k not in values or roots[k] != values[k]}
+        if changed:
+            stale = dependents(changed, injector) - names - setup_keys
+            rerun = resolve(stale, injector, concurrent=concurrent)
+            results = {k: roots[k] for k in changed}
+            results.update((k, rerun[k]) for k in stale)
+
+    finally:
+        release(seeded | affected, injector)
+
+    values.update(results)
+    return results
+
+
+# -------------------------------------------------------------------
+def inject(
+    namespace: dict,
+    injector: SyncInjector = injector,
+    timings_file: Optional[str] = None,
+):
+    """
+    Resolve all config, config set, and setup resources and inject them
+    into the given namespace.  Config resources and their dependencies are
+    resolved concurrently, while setup resources are run afterwards in the
+    calling thread.
+
+    The time spent in each provider is logged afterwards, and if
+    `timings_file` is specified, or otherwise `QTILE_CONFIG_TIMINGS` is set,
+    the report is also written there as JSON.
+    """
+    if timings_file is None:
+        timings_file = os.environ.get("QTILE_CONFIG_TIMINGS")
+    timings.clear()
+
+    config_keys = _scan(injector, "qtile_config")
+    config_set_keys = _scan(injector, "qtile_config_set")
+    setup_keys = _scan(injector, "qtile_setup")
+    names = {
+        *config_keys,
+        *config_set_keys,
+        *(dep for key in setup_keys for dep in injector.get_dependencies(key)),
+    }
+
+    try:
+        resolved = resolve(names, injector)
+        resolved_values[injector] = dict(resolved)
+
+        for key in config_keys:
+            namespace[key] = injector.require(key)
+
+        for key in config_set_keys:
+            config_set = injector.require(key)
+            for k, v in config_set.items():
+                namespace[k] = v
+
+        for key in setup_keys:
+            injector.require(key)
 
-    for key in _scan(injector, "qtile_config_set"):
-        config_set = injector.require(key)
-        for k, v in config_set.items():
-            namespace[k] = v
+    finally:
+        # Includes any values left behind if a provider failed.
+        release(dependency_graph(names, injector), injector)
 
-    for key in _scan(injector, "qtile_setup"):
-        injector.require(key)
+    timings.log_report(injector)
+    if timings_file:
+        timings.write_report(injector, Path(timings_file))
@@ -0,0 +1,59 @@
+# --------------------------------------------------------------------
+# hardware.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Fork-free discovery of connected outputs and batteries from sysfs.
+
+These functions return None when the relevant sysfs class isn't available,
+so that callers can fall back to asking `xrandr` or `upower` instead.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+DRM_PATH = Path("/sys/class/drm")
+POWER_SUPPLY_PATH = Path("/sys/class/power_supply")
+
+
+# --------------------------------------------------------------------
+def read_attr(path: Path) -> Optional[str]:
+    try:
+        with open(path, "r") as infile:
+            return infile.read().strip()
+    except OSError:
+        return None
+
+
+# --------------------------------------------------------------------
+def connected_outputs(drm_path: Path = DRM_PATH) -> Optional[list[str]]:
+    """
+    Get the names of the DRM connectors which report a connected display.
+    """
+    if not drm_path.is_dir():
+        return None
+    return [
+        connector.name
+        for connector in sorted(drm_path.iterdir())
+        if read_attr(connector / "status") == "connected"
+    ]
+
+
+# --------------------------------------------------------------------
+def batteries(power_supply_path: Path = POWER_SUPPLY_PATH) -> Optional[list[str]]:
+    """
+    Get the names of the system batteries, e.g. "BAT0".  Batteries in
+    peripherals such as mice and keyboards aren't included.
+    """
+    if not power_supply_path.is_dir():
+        return None
+    return [
+        supply.name
+        for supply in sorted(power_supply_path.iterdir())
+        if supply.name.startswith("BAT") and read_attr(supply / "type") == "Battery"
+    ]
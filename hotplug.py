@@ -0,0 +1,131 @@
+# --------------------------------------------------------------------
+# hotplug.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Applies monitor and battery hotplug events to the running qtile by
+re-running only the providers which depend on `num_screens` or
+`num_batteries`, instead of restarting.
+"""
+
+import asyncio
+import time
+from typing import Optional, Set
+
+from libqtile import bar, hook, qtile
+from libqtile.core.manager import Qtile
+from libqtile.log_utils import logger
+
+from cache import provider_cache
+from framework import refresh
+from netlink import UeventMonitor
+from sampler import SystemSampler
+
+
+# --------------------------------------------------------------------
+class Hotplug:
+    debounce_sec = 0.25
+
+    pending: Set[str] = set()
+    reconfigure = False
+    timer = None
+    monitor: Optional[UeventMonitor] = None
+
+    @classmethod
+    def schedule(cls, qtile: Qtile, name: str, reconfigure=False):
+        """
+        Refresh `name` and its dependents once the burst of events that
+        usually accompanies a hotplug has settled.
+        """
+        cls.pending.add(name)
+        cls.reconfigure = cls.reconfigure or reconfigure
+        if cls.timer is not None:
+            cls.timer.cancel()
+        cls.timer = qtile.call_later(cls.debounce_sec, cls.apply, qtile)
+
+    @classmethod
+    def swap_bars(cls, qtile: Qtile, screens: list):
+        """
+        Move the bars of the new screens onto the existing `Screen` objects,
+        which qtile keeps references to, e.g. as `qtile.current_screen`.
+        The replaced bars are killed, which finalizes their widgets.
+        Screens which are no longer needed are dropped, and qtile kills
+        their bars itself when the screens are reconfigured.
+        """
+        current = qtile.config.screens
+        for old, new in zip(current, screens):
+            for side in ("top", "bottom", "left", "right"):
+                gap = getattr(old, side)
+                if isinstance(gap, bar.Bar) and gap.window:
+                    gap.kill_window()
+                setattr(old, side, getattr(new, side))
+        qtile.config.screens = current[: len(screens)] + screens[len(current) :]
+
+    @classmethod
+    def apply(cls, qtile: Qtile):
+        """
+        Apply the pending refreshes, falling back to qtile's own screen
+        reconfiguration if they fail.
+        """
+        cls.timer = None
+        names, cls.pending = cls.pending, set()
+        reconfigure, cls.reconfigure = cls.reconfigure, False
+
+        try:
+            cls.reload(qtile, names, reconfigure)
+        except Exception:
+            logger.exception("Hotplug: failed to refresh %s", ",".join(sorted(names)))
+            qtile.reconfigure_screens()
+
+    @classmethod
+    def reload(cls, qtile: Qtile, names: Set[str], reconfigure: bool):
+        start = time.perf_counter()
+        if "num_batteries" in names:
+            SystemSampler.battery_files = None
+
+        # Widgets are built in qtile's thread, as they are at startup.
+        values = refresh(names, concurrent=False)
+        provider_cache.save()
+
+        if "screens" in values:
+            cls.swap_bars(qtile, values["screens"])
+            reconfigure = True
+
+        if reconfigure:
+            qtile.reconfigure_screens()
+
+        logger.info(
+            "Hotplug: refreshed %s in %.1fms",
+            ",".join(sorted(values)) or "nothing",
+            (time.perf_counter() - start) * 1000,
+        )
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def start_monitoring():
+            assert isinstance(qtile, Qtile)
+            try:
+                cls.monitor = UeventMonitor(
+                    lambda: cls.schedule(qtile, "num_batteries"), "power_supply"
+                )
+                cls.monitor.start(asyncio.get_event_loop())
+            except OSError:
+                logger.exception("Hotplug: can't monitor power supply events.")
+                cls.monitor = None
+
+        @hook.subscribe.shutdown
+        def stop_monitoring():
+            if cls.monitor is not None:
+                cls.monitor.stop(asyncio.get_event_loop())
+                cls.monitor = None
+
+        @hook.subscribe.screen_change
+        def on_screen_change(*_):
+            assert isinstance(qtile, Qtile)
+            cls.schedule(qtile, "num_screens", reconfigure=True)
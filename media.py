@@ -5,17 +5,21 @@
 # Date: Wednesday July 26, 2023
 # --------------------------------------------------------------------
 
-from typing import Optional
+from array import array
+from math import gcd
+from typing import Iterator, Optional, Tuple
 
 from dataclasses import dataclass
 from libqtile import hook, qtile
 from libqtile.backend.base import Window
 from libqtile.core.manager import Qtile
 
-from timeutil import get_millis
+from timeutil import now_ns, sec_to_ns
 from constants import Subjects
+from frames import Deltas, FrameAccumulator
 from maths import clamp
 from status import Status
+from tracking import TiledMRU
 
 
 # --------------------------------------------------------------------
@@ -26,11 +30,38 @@ class Resolution:
 
     @classmethod
     def by_aspect_ratio(cls, width: int, height: int, max_width: int = 10000):
-        for x in range(width, max_width + 1):
-            if x % 5 == 0:
-                y = x / width * height
-                if y.is_integer() and y % 5 == 0:
-                    yield Resolution(x, int(y))
+        yield from ResolutionTable(width, height, max_width)
+
+
+# --------------------------------------------------------------------
+class ResolutionTable:
+    """
+    The resolutions of a given aspect ratio with both dimensions divisible
+    by 5, stored as a pair of compact arrays.
+
+    With the ratio reduced to `w:h`, every such resolution is a multiple of
+    `5w x 5h`, so the table is computed in closed form instead of by
+    scanning every width up to `max_width`.
+    """
+
+    def __init__(self, width: int, height: int, max_width: int = 10000):
+        self.aspect = (width, height)
+        divisor = gcd(width, height)
+        step_x = 5 * (width // divisor)
+        step_y = 5 * (height // divisor)
+        start = -(-width // step_x)
+        self.widths = array("I", range(start * step_x, max_width + 1, step_x))
+        self.heights = array("I", (x // step_x * step_y for x in self.widths))
+
+    def __len__(self) -> int:
+        return len(self.widths)
+
+    def __getitem__(self, n: int) -> Resolution:
+        return Resolution(self.widths[n], self.heights[n])
+
+    def __iter__(self) -> Iterator[Resolution]:
+        for x, y in zip(self.widths, self.heights):
+            yield Resolution(x, y)
 
 
 # --------------------------------------------------------------------
@@ -43,14 +74,29 @@ class MediaContainer:
     size = 10
     allow_focus = False
     adj_inc = 1
-    adj_ms = 0
+    adj_ns = 0
+    adj_accel_ns = sec_to_ns(0.05)
     bar_height = 0
 
     window: Optional[Window] = None
+    resolutions: Optional[ResolutionTable] = None
+    adjustments: Optional[FrameAccumulator] = None
+    # The last geometry we requested, and the window's geometry after the
+    # request, which may differ once the window's size hints are applied.
+    requested: Optional[Tuple[int, int, int, int]] = None
+    geometry: Optional[Tuple[int, int, int, int]] = None
+    on_top = False
 
     @classmethod
-    def get_resolutions(cls) -> list[Resolution]:
-        return [*Resolution.by_aspect_ratio(cls.aspect_x, cls.aspect_y)]
+    def get_resolutions(cls) -> ResolutionTable:
+        """
+        Get the resolution table for the current aspect ratio, rebuilding
+        it only when `aspect_x` or `aspect_y` have changed.
+        """
+        table = cls.resolutions
+        if table is None or table.aspect != (cls.aspect_x, cls.aspect_y):
+            table = cls.resolutions = ResolutionTable(cls.aspect_x, cls.aspect_y)
+        return table
 
     @classmethod
     def toggle_media(cls, qtile: Qtile):
@@ -87,6 +133,7 @@ class MediaContainer:
 
         # Reset for the next media window.
         cls.visible = True
+        cls.forget_geometry()
 
     @classmethod
     def media_front_toggle(cls, qtile: Qtile):
@@ -104,35 +151,49 @@ class MediaContainer:
 
     @classmethod
     def _adj_ratio(cls, adj) -> int:
-        now_ms = get_millis()
-        if now_ms - cls.adj_ms < 50:
+        now = now_ns()
+        if now - cls.adj_ns < cls.adj_accel_ns:
             cls.adj_inc += 1
         else:
             cls.adj_inc = 1
-        cls.adj_ms = now_ms
+        cls.adj_ns = now
         return cls.adj_inc * adj
 
+    @classmethod
+    def apply_adjustments(cls, qtile: Qtile, deltas: Deltas):
+        cls.size = clamp(0, len(cls.get_resolutions()) - 1, cls.size + int(deltas.get("size", 0)))
+        cls.pad_x = max(0, cls.pad_x + int(deltas.get("pad_x", 0)))
+        cls.pad_y = max(0, cls.pad_y + int(deltas.get("pad_y", 0)))
+        cls.position_media_window(qtile, True)
+
+    @classmethod
+    def adjust(cls, qtile: Qtile, name: str, delta: int):
+        """
+        Queue an adjustment to be applied on the next frame, so that a held
+        key repositions the media window at most once per frame.
+        """
+        if cls.adjustments is None:
+            cls.adjustments = FrameAccumulator(cls.apply_adjustments)
+        cls.adjustments.add(qtile, name, delta)
+
     @classmethod
     def adjust_size(cls, adj: int):
         def _adjust_size(qtile: Qtile):
-            cls.size = clamp(0, len(cls.get_resolutions()), cls.size + adj)
-            cls.position_media_window(qtile, True)
+            cls.adjust(qtile, "size", adj)
 
         return _adjust_size
 
     @classmethod
     def adjust_pad_x(cls, adj: int):
         def _adjust_pad_x(qtile: Qtile):
-            cls.pad_x = max(0, cls.pad_x + cls._adj_ratio(adj))
-            cls.position_media_window(qtile, True)
+            cls.adjust(qtile, "pad_x", cls._adj_ratio(adj))
 
         return _adjust_pad_x
 
     @classmethod
     def adjust_pad_y(cls, adj: int):
         def _adjust_pad_y(qtile: Qtile):
-            cls.pad_y = max(0, cls.pad_y + cls._adj_ratio(adj))
-            cls.position_media_window(qtile, True)
+            cls.adjust(qtile, "pad_y", cls._adj_ratio(adj))
 
         return _adjust_pad_y
 
@@ -146,15 +207,34 @@ class MediaContainer:
 
         return _adjust_opacity
 
+    @classmethod
+    def forget_geometry(cls):
+        """
+        Forget the geometry and stacking last applied to the media window,
+        so that the next `position_media_window()` sets them again.
+        """
+        cls.requested = None
+        cls.geometry = None
+        cls.on_top = False
+
     @classmethod
     def position_media_window(cls, qtile: Qtile, print_status=False):
+        """
+        Place the media window, only sending the X requests for the parts
+        of its geometry and stacking which have changed since they were
+        last applied.
+        """
         assert cls.window is not None
 
         if not cls.visible:
-            cls.window.minimized = True
+            if not cls.window.minimized:
+                cls.window.minimized = True
+            cls.on_top = False
             return
 
-        cls.window.minimized = False
+        if cls.window.minimized:
+            cls.window.minimized = False
+            cls.on_top = False
 
         res = cls.get_resolutions()[cls.size]
         cls.pad_x = clamp(
@@ -170,9 +250,23 @@ class MediaContainer:
         offset_x = qtile.current_screen.x + qtile.current_screen.width - res.width - cls.pad_x
         offset_y = qtile.current_screen.y + cls.pad_y
 
-        cls.window.cmd_set_size_floating(res.width, res.height)
-        cls.window.cmd_set_position_floating(offset_x, offset_y)
-        cls.window.cmd_bring_to_front()
+        # Drop the cache if the window was moved, resized, or tiled by
+        # something other than us.
+        window = cls.window
+        if cls.geometry != (window.x, window.y, window.width, window.height) or not window.floating:
+            cls.requested = None
+
+        old_x, old_y, old_width, old_height = cls.requested or (None, None, None, None)
+        if (res.width, res.height) != (old_width, old_height):
+            window.cmd_set_size_floating(res.width, res.height)
+        if (offset_x, offset_y) != (old_x, old_y):
+            window.cmd_set_position_floating(offset_x, offset_y)
+        cls.requested = (offset_x, offset_y, res.width, res.height)
+        cls.geometry = (window.x, window.y, window.width, window.height)
+
+        if not cls.on_top:
+            window.cmd_bring_to_front()
+            cls.on_top = True
 
         if print_status:
             Status.show(
@@ -181,19 +275,14 @@ class MediaContainer:
             )
 
     @classmethod
-    def focus_last_non_floating_window(cls, qtile: Qtile):
-        if cls.window is not None:
-            group = qtile.current_group
-            windows = reversed([w for w in group.focus_history if not w.floating])
-            last_window = next(windows, None)
-
-        if last_window is MediaContainer.window:
-            last_window = next(windows, None)
-
-        if last_window is not None:
-            group.focus(last_window)
-        else:
-            group.focus(None)
+    def focus_last_non_floating_window(cls, qtile: Qtile, closing: Optional[Window] = None):
+        """
+        Focus the most recently focused non-floating window in the current
+        group other than the media window and `closing`, or nothing if
+        there isn't one.
+        """
+        group = qtile.current_group
+        group.focus(TiledMRU.last(group, exclude=(cls.window, closing)))
 
     @classmethod
     def focus_media(cls, qtile):
@@ -207,13 +296,15 @@ class MediaContainer:
         def on_window_open(window: Window):
             assert isinstance(qtile, Qtile)
             if MediaContainer.window is not None:
+                # The new window may be stacked above the media window.
+                MediaContainer.on_top = False
                 MediaContainer.position_media_window(qtile)
 
         @hook.subscribe.client_killed
         def on_window_close(window: Window):
             assert isinstance(qtile, Qtile)
             if MediaContainer.window is not None:
-                cls.focus_last_non_floating_window(qtile)
+                cls.focus_last_non_floating_window(qtile, closing=window)
                 if window is MediaContainer.window:
                     MediaContainer.forget_media(unfloat=False)
 
@@ -230,3 +321,6 @@ class MediaContainer:
                     cls.allow_focus = False
                 else:
                     cls.focus_last_non_floating_window(qtile)
+            else:
+                # Focusing another window may raise it above the media window.
+                MediaContainer.on_top = False
@@ -0,0 +1,155 @@
+# --------------------------------------------------------------------
+# netlink.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Minimal netlink subscribers for link and IPv4 address events, and for
+kernel device events (uevents).
+"""
+
+import asyncio
+import errno
+import socket
+import struct
+from typing import Any, Callable, Dict, Iterable, List
+
+NETLINK_ROUTE = 0
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+EVENT_TYPES = {RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR}
+
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 0x1
+
+# struct nlmsghdr: length, type, flags, sequence number, port id
+NLMSG_HEADER = struct.Struct("=IHHII")
+
+
+# --------------------------------------------------------------------
+def parse_message_types(data: bytes) -> List[int]:
+    """
+    Get the message types of each netlink message in a datagram.  Parsing
+    stops at the first malformed or truncated message.
+    """
+    types = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size or offset + length > len(data):
+            break
+        types.append(msg_type)
+        offset += (length + 3) & ~3
+    return types
+
+
+# --------------------------------------------------------------------
+def parse_uevent(data: bytes) -> Dict[str, str]:
+    """
+    Parse the properties of a kernel uevent datagram, which is a header of
+    the form "action@devpath" followed by null-terminated "KEY=VALUE"
+    pairs.
+    """
+    event = {}
+    for field in data.split(b"\0")[1:]:
+        key, sep, value = field.partition(b"=")
+        if sep:
+            event[key.decode("utf-8", errors="replace")] = value.decode("utf-8", errors="replace")
+    return event
+
+
+# --------------------------------------------------------------------
+class NetlinkMonitor:
+    """
+    Calls `callback` once per batch of link or address events.
+
+    `sock` may be any non-blocking object with `recv()` and `fileno()`,
+    such as a stand-in replaying recorded netlink datagrams which raises
+    `BlockingIOError` once it is drained.
+    """
+
+    def __init__(self, callback: Callable[[], None], sock: Any = None):
+        self.callback = callback
+        self.sock = sock if sock is not None else self.open_socket()
+
+    @staticmethod
+    def open_socket() -> socket.socket:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        sock.setblocking(False)
+        return sock
+
+    def is_event(self, data: bytes) -> bool:
+        return any(t in EVENT_TYPES for t in parse_message_types(data))
+
+    def on_readable(self):
+        """
+        Drain all pending datagrams, then invoke the callback if any of
+        them contained an event.
+        """
+        changed = False
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # The receive buffer overran and events were dropped, so we
+                # can't know what changed.
+                if e.errno == errno.ENOBUFS:
+                    changed = True
+                    continue
+                raise
+            if not data:
+                break
+            if self.is_event(data):
+                changed = True
+
+        if changed:
+            self.callback()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        loop.add_reader(self.sock.fileno(), self.on_readable)
+
+    def stop(self, loop: asyncio.AbstractEventLoop):
+        loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+
+
+# --------------------------------------------------------------------
+class UeventMonitor(NetlinkMonitor):
+    """
+    Calls `callback` once per batch of kernel uevents for devices in the
+    given subsystem, e.g. "power_supply", with one of the given actions.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        subsystem: str,
+        actions: Iterable[str] = ("add", "remove"),
+        sock: Any = None,
+    ):
+        self.subsystem = subsystem
+        self.actions = set(actions)
+        super().__init__(callback, sock)
+
+    @staticmethod
+    def open_socket() -> socket.socket:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, UEVENT_KERNEL_GROUP))
+        sock.setblocking(False)
+        return sock
+
+    def is_event(self, data: bytes) -> bool:
+        event = parse_uevent(data)
+        return event.get("SUBSYSTEM") == self.subsystem and event.get("ACTION") in self.actions
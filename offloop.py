@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------
+# offloop.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Runs blocking polls on the default executor instead of qtile's event loop.
+"""
+
+import asyncio
+import functools
+from typing import Any, Callable, Optional
+
+from libqtile.log_utils import logger
+
+
+# --------------------------------------------------------------------
+class OffloopPoll:
+    """
+    Runs a blocking function in the event loop's default executor and hands
+    its result back on the event loop.
+
+    At most one call runs at a time: submitting while a call is in flight
+    is refused, so the caller keeps showing its last good value.  A call
+    which takes longer than `timeout` seconds is logged and its result is
+    discarded when it finally arrives.  Python threads can't be interrupted,
+    so a stuck call still blocks further submissions until it returns.
+    """
+
+    def __init__(self, name: str, timeout: float = 1.0):
+        self.name = name
+        self.timeout = timeout
+        self.future: Optional[asyncio.Future] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.timed_out = False
+        self.late = 0
+        self.refused = 0
+
+    def busy(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def submit(self, func: Callable[[], Any], on_result: Callable[[Any], None]) -> bool:
+        """
+        Run `func` off the event loop and pass its result to `on_result`.
+        Returns False if a previous call is still in flight.
+        """
+        if self.busy():
+            self.refused += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        self.timed_out = False
+        self.future = loop.run_in_executor(None, func)
+        self.timer = loop.call_later(self.timeout, self.on_timeout)
+        self.future.add_done_callback(functools.partial(self.on_done, on_result))
+        return True
+
+    def on_timeout(self):
+        if self.busy():
+            self.timed_out = True
+            self.late += 1
+            logger.warning(
+                "%s: poll took longer than %.1fs, keeping the last value.",
+                self.name,
+                self.timeout,
+            )
+
+    def on_done(self, on_result: Callable[[Any], None], future: asyncio.Future):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        if future.cancelled() or self.timed_out:
+            return
+
+        exception = future.exception()
+        if exception is not None:
+            logger.error("%s: poll failed.", self.name, exc_info=exception)
+            return
+
+        on_result(future.result())
@@ -0,0 +1,147 @@
+# --------------------------------------------------------------------
+# palette.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Watches ~/.Xdefaults and pushes Base16 colorscheme changes to the running
+bars, widgets, and layouts without restarting qtile.
+"""
+
+from typing import Any, Optional
+
+from libqtile import bar, hook, qtile
+from libqtile.core.manager import Qtile
+from libqtile.log_utils import logger
+
+from base16 import XDEFAULTS_FILE, Base16, Color
+
+
+# --------------------------------------------------------------------
+def is_changed(value: Any, changes: dict[int, str]) -> bool:
+    return isinstance(value, Color) and value.slot in changes
+
+
+# --------------------------------------------------------------------
+def new_color(value: Any, changes: dict[int, str]) -> Any:
+    if is_changed(value, changes):
+        return Color(changes[value.slot], value.slot)
+    return value
+
+
+# --------------------------------------------------------------------
+def recolor(obj: Any, changes: dict[int, str], attrs: list[str]) -> bool:
+    """
+    Replace any of the given color attributes of `obj` which hold a color
+    from a Base16 slot that changed.  Colors which didn't come from the
+    colorscheme are left alone, even if they have the same value.  Returns
+    True if anything was replaced.
+    """
+    changed = False
+    for attr in attrs:
+        value = getattr(obj, attr, None)
+        if is_changed(value, changes):
+            setattr(obj, attr, new_color(value, changes))
+            changed = True
+        elif isinstance(value, list) and any(is_changed(v, changes) for v in value):
+            setattr(obj, attr, [new_color(v, changes) for v in value])
+            changed = True
+    return changed
+
+
+# --------------------------------------------------------------------
+class PaletteWatcher:
+    check_sec = 2.0
+    mtime_ns = 0
+    base16: Optional[Base16] = None
+
+    bar_attrs = ["background", "border_color"]
+    widget_attrs = [
+        "foreground",
+        "background",
+        "active",
+        "inactive",
+        "block_highlight_text_color",
+        "highlight_color",
+        "this_current_screen_border",
+        "this_screen_border",
+        "other_screen_current_border",
+        "other_screen_border",
+        "urgent_border",
+        "urgent_text",
+    ]
+    layout_attrs = [
+        "border_focus",
+        "border_normal",
+        "border_focus_stack",
+        "border_normal_stack",
+    ]
+
+    @classmethod
+    def get_mtime_ns(cls) -> int:
+        try:
+            return XDEFAULTS_FILE.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    @classmethod
+    def check(cls, qtile: Qtile):
+        mtime_ns = cls.get_mtime_ns()
+        if mtime_ns != cls.mtime_ns:
+            cls.mtime_ns = mtime_ns
+            try:
+                cls.apply(qtile)
+            except Exception:
+                logger.exception("Failed to reload the Base16 colorscheme.")
+        qtile.call_later(cls.check_sec, cls.check, qtile)
+
+    @classmethod
+    def apply(cls, qtile: Qtile):
+        """
+        Reload the colorscheme and update everything using a color which
+        changed.  Only the widgets whose colors changed are redrawn.
+        """
+        assert cls.base16 is not None
+        changes = cls.base16.reload()
+        if not changes:
+            return
+
+        seen = set()
+        for screen in qtile.screens:
+            for gap in screen.gaps:
+                if not isinstance(gap, bar.Bar):
+                    continue
+                redraw = []
+                for widget in gap.widgets:
+                    # Mirrors are redrawn along with the widget they reflect.
+                    if hasattr(widget, "reflects") or id(widget) in seen:
+                        continue
+                    seen.add(id(widget))
+                    if recolor(widget, changes, cls.widget_attrs):
+                        redraw.append(widget)
+                if recolor(gap, changes, cls.bar_attrs):
+                    gap.draw()
+                else:
+                    for widget in redraw:
+                        widget.draw()
+
+        for group in qtile.groups:
+            for layout in [*group.layouts, group.floating_layout]:
+                recolor(layout, changes, cls.layout_attrs)
+
+        for screen in qtile.screens:
+            screen.group.layout_all()
+
+    @classmethod
+    def setup_hooks(cls, base16: Base16):
+        cls.base16 = base16
+
+        @hook.subscribe.startup_complete
+        def start_watching():
+            assert isinstance(qtile, Qtile)
+            cls.mtime_ns = cls.get_mtime_ns()
+            qtile.call_later(cls.check_sec, cls.check, qtile)
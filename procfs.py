@@ -0,0 +1,103 @@
+# --------------------------------------------------------------------
+# procfs.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Cheap, repeated reads of /proc and /sys files.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+
+# --------------------------------------------------------------------
+class ProcFile:
+    """
+    A /proc or /sys file which is kept open and re-read from offset 0 on
+    every read, saving the open() and close() per sample.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+
+    def read(self) -> str:
+        if self.file is None:
+            self.file = open(self.path, "rb", buffering=0)
+        self.file.seek(0)
+        return self.file.read().decode("utf-8")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# --------------------------------------------------------------------
+def parse_net_dev(text: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse the contents of /proc/net/dev into a map from interface name to
+    its received and transmitted byte counters.
+    """
+    counters = {}
+    for line in text.splitlines()[2:]:
+        iface, _, fields = line.partition(":")
+        values = fields.split()
+        if len(values) >= 9:
+            counters[iface.strip()] = (int(values[0]), int(values[8]))
+    return counters
+
+
+# --------------------------------------------------------------------
+RATE_UNITS = "BKMGT"
+
+
+def format_rate(bytes_per_sec: float) -> str:
+    n = 0
+    while bytes_per_sec >= 1000 and n < len(RATE_UNITS) - 1:
+        bytes_per_sec /= 1024
+        n += 1
+    unit = RATE_UNITS[n]
+    return f"{bytes_per_sec:.0f}{unit}" if unit == "B" else f"{bytes_per_sec:.1f}{unit}"
+
+
+# --------------------------------------------------------------------
+class NetDevRates:
+    """
+    Computes per-interface receive and transmit rates in bytes per second
+    from one read of /proc/net/dev per sample.
+    """
+
+    def __init__(self, path: str = "/proc/net/dev"):
+        self.file = ProcFile(path)
+        self.counters: Dict[str, Tuple[int, int]] = {}
+        self.sample_time: Optional[float] = None
+        self.rates: Dict[str, Tuple[float, float]] = {}
+
+    def sample(self) -> Dict[str, Tuple[float, float]]:
+        now = time.monotonic()
+        counters = parse_net_dev(self.file.read())
+
+        if self.sample_time is not None and now > self.sample_time:
+            elapsed = now - self.sample_time
+            self.rates = {}
+            for iface, (rx, tx) in counters.items():
+                if iface in self.counters:
+                    last_rx, last_tx = self.counters[iface]
+                    # Counters reset when an interface is re-created.
+                    self.rates[iface] = (
+                        max(0, rx - last_rx) / elapsed,
+                        max(0, tx - last_tx) / elapsed,
+                    )
+
+        self.counters = counters
+        self.sample_time = now
+        return self.rates
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,159 @@
+# --------------------------------------------------------------------
+# rules.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+A compiled index of window rules, so that classifying a window doesn't
+cost one `Match.compare()` per rule.
+
+Rules are grouped by tag, e.g. "float" or "media".  Single-property rules
+on `wm_class`, `title` or `wm_type` with a plain string are indexed in hash
+tables, and those with a regex on `wm_class` or `title` are combined into
+one pattern per tag and property, with each pattern's flags scoped to its
+own alternative.  Any other rule is kept as a `Match` and compared as
+usual.
+
+Unlike `Match`, which treats a string `wm_class` or `title` as matching
+any window whose value is a substring of it, indexed strings must match
+exactly.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, FrozenSet, Iterable, List, Set
+
+from libqtile.backend.base import Window
+from libqtile.config import Match
+
+INDEXED_STRINGS = ("wm_class", "title", "wm_type")
+INDEXED_PATTERNS = ("wm_class", "title")
+
+# Flags which can be scoped to a group, and their inline letters.
+SCOPED_FLAGS = (
+    (re.ASCII, "a"),
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+SCOPABLE = re.UNICODE | re.ASCII | re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+# --------------------------------------------------------------------
+def is_scopable(pattern: re.Pattern) -> bool:
+    return (
+        isinstance(pattern.pattern, str)
+        and pattern.groups == 0
+        and not pattern.flags & ~SCOPABLE
+    )
+
+
+# --------------------------------------------------------------------
+def scoped_pattern(pattern: re.Pattern) -> str:
+    """
+    Get the source of a compiled pattern as a group with the pattern's
+    flags scoped to it, so that it can be combined with other patterns.
+    Inline global flags, which can only appear at the start of a pattern,
+    are removed, as they are reflected in `pattern.flags`.
+    """
+    source = pattern.pattern
+    while m := GLOBAL_FLAGS.match(source):
+        source = source[m.end() :]
+    letters = "".join(letter for flag, letter in SCOPED_FLAGS if pattern.flags & flag)
+    if pattern.flags & re.VERBOSE:
+        # Don't let a trailing comment swallow the closing parenthesis.
+        source += "\n"
+    return f"(?{letters}:{source})"
+
+
+# --------------------------------------------------------------------
+class RuleIndex:
+    def __init__(self):
+        self.strings: Dict[str, DefaultDict[str, Set[str]]] = {
+            prop: defaultdict(set) for prop in INDEXED_STRINGS
+        }
+        self.patterns: Dict[str, DefaultDict[str, List[str]]] = {
+            prop: defaultdict(list) for prop in INDEXED_PATTERNS
+        }
+        self.compiled: Dict[str, Dict[str, re.Pattern]] = {}
+        self.fallback: DefaultDict[str, List[Match]] = defaultdict(list)
+
+    def add(self, tag: str, rules: Iterable[Match]) -> "RuleIndex":
+        for rule in rules:
+            props: Dict[str, Any] = getattr(rule, "_rules", {})
+            if len(props) != 1:
+                self.fallback[tag].append(rule)
+                continue
+
+            [(prop, value)] = props.items()
+            if prop in INDEXED_STRINGS and isinstance(value, str):
+                self.strings[prop][value].add(tag)
+            elif prop in INDEXED_PATTERNS and isinstance(value, re.Pattern) and is_scopable(value):
+                self.patterns[prop][tag].append(scoped_pattern(value))
+            else:
+                self.fallback[tag].append(rule)
+
+        self.compiled = {
+            prop: {tag: re.compile("|".join(p)) for tag, p in by_tag.items()}
+            for prop, by_tag in self.patterns.items()
+        }
+        return self
+
+    def classify(self, client: Window) -> FrozenSet[str]:
+        """
+        Get the tags of all of the rule groups which match the window.
+        """
+        tags: Set[str] = set()
+
+        wm_class = client.get_wm_class() or []
+        title = client.name
+        values = {
+            "wm_class": wm_class,
+            "title": [title] if title is not None else [],
+            "wm_type": [client.get_wm_type()],
+        }
+
+        for prop, index in self.strings.items():
+            for value in values[prop]:
+                tags.update(index.get(value, ()))
+
+        for prop, by_tag in self.compiled.items():
+            for tag, pattern in by_tag.items():
+                if tag not in tags and any(pattern.match(v) for v in values[prop]):
+                    tags.add(tag)
+
+        for tag, rules in self.fallback.items():
+            if tag not in tags and any(rule.compare(client) for rule in rules):
+                tags.add(tag)
+
+        return frozenset(tags)
+
+    def matches(self, client: Window, tag: str) -> bool:
+        return tag in self.classify(client)
+
+    def rule(self, tag: str) -> "TagRule":
+        return TagRule(self, tag)
+
+
+# --------------------------------------------------------------------
+class TagRule:
+    """
+    A `Match`-like rule which matches windows in one of a `RuleIndex`'s
+    tags, for use where qtile expects a list of rules, e.g. `float_rules`.
+    """
+
+    def __init__(self, index: RuleIndex, tag: str):
+        self.index = index
+        self.tag = tag
+
+    def compare(self, client: Window) -> bool:
+        return self.index.matches(client, self.tag)
+
+    def __repr__(self) -> str:
+        return f"<TagRule {self.tag!r}>"
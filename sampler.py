@@ -0,0 +1,229 @@
+# --------------------------------------------------------------------
+# sampler.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+A shared system sampler which reads all of the metrics shown in the bar
+once per tick and fans the snapshot out to subscribing widgets.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from libqtile import qtile
+from libqtile.log_utils import logger
+
+import hardware
+from offloop import OffloopPoll
+from procfs import NetDevRates, ProcFile
+
+
+# --------------------------------------------------------------------
+@dataclass
+class BatteryState:
+    name: str
+    percent: float
+    status: str
+
+
+# --------------------------------------------------------------------
+@dataclass
+class Snapshot:
+    mem_percent: float = 0.0
+    # None until two samples of the CPU times are far enough apart.
+    cpu_percent: Optional[float] = None
+    net_rates: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    batteries: List[BatteryState] = field(default_factory=list)
+
+
+# --------------------------------------------------------------------
+def parse_meminfo(text: str) -> float:
+    """
+    Get the percentage of memory used from /proc/meminfo, computed the
+    same way as `psutil.virtual_memory()`.
+    """
+    info = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        info[key] = int(value.split()[0])
+    total = info["MemTotal"]
+    used = total - info["MemFree"] - info["Buffers"] - info["Cached"] - info.get("SReclaimable", 0)
+    if used < 0:
+        used = total - info["MemFree"]
+    return used / total * 100
+
+
+# --------------------------------------------------------------------
+def parse_cpu_times(text: str) -> Tuple[int, int]:
+    """
+    Get the total and idle jiffies from the aggregate line of /proc/stat.
+    """
+    values = [int(v) for v in text.split("\n", 1)[0].split()[1:]]
+    # Guest time is already counted in user and nice time.
+    total = sum(values[:8])
+    idle = values[3] + values[4]
+    return total, idle
+
+
+# --------------------------------------------------------------------
+SampleCallback = Callable[[Snapshot], None]
+
+
+# --------------------------------------------------------------------
+class SystemSampler:
+    update_interval = 1.0
+    battery_update_interval = 30.0
+    use_executor = True
+    poller = OffloopPoll("SystemSampler", timeout=1.0)
+
+    subscribers: List[SampleCallback] = []
+    snapshot: Optional[Snapshot] = None
+    timer = None
+
+    meminfo = ProcFile("/proc/meminfo")
+    stat = ProcFile("/proc/stat")
+    net_dev = NetDevRates()
+    battery_files: Optional[List[Tuple[str, ProcFile, ProcFile]]] = None
+    battery_ttl = 0.0
+    cpu_times: Tuple[int, int] = (0, 0)
+
+    ticks = 0
+    last_tick_ns = 0
+    total_tick_ns = 0
+
+    @classmethod
+    def subscribe(cls, callback: SampleCallback):
+        """
+        Register a callback to receive each snapshot.  Sampling starts with
+        the first subscriber and stops when the last one unsubscribes.  If
+        sampling is running, the callback gets the latest snapshot right
+        away, and otherwise a fresh one is taken.
+        """
+        if callback in cls.subscribers:
+            return
+        cls.subscribers.append(callback)
+        if cls.timer is None:
+            cls.tick()
+        elif cls.snapshot is not None:
+            callback(cls.snapshot)
+
+    @classmethod
+    def unsubscribe(cls, callback: SampleCallback):
+        if callback in cls.subscribers:
+            cls.subscribers.remove(callback)
+        if not cls.subscribers and cls.timer is not None:
+            cls.timer.cancel()
+            cls.timer = None
+            # Don't serve a stale snapshot, or stale batteries, on resume.
+            cls.snapshot = None
+
+    @classmethod
+    def prime_cpu(cls):
+        """
+        Take an initial reading of the CPU times, so that the first sample
+        measures the load since now rather than since boot.
+        """
+        if cls.cpu_times == (0, 0):
+            cls.cpu_times = parse_cpu_times(cls.stat.read())
+
+    @classmethod
+    def sample_batteries(cls) -> List[BatteryState]:
+        if cls.battery_files is None:
+            cls.battery_files = [
+                (
+                    name,
+                    ProcFile(str(hardware.POWER_SUPPLY_PATH / name / "capacity")),
+                    ProcFile(str(hardware.POWER_SUPPLY_PATH / name / "status")),
+                )
+                for name in hardware.batteries() or []
+            ]
+        batteries = []
+        for name, capacity, status in cls.battery_files:
+            try:
+                batteries.append(
+                    BatteryState(name, int(capacity.read()) / 100, status.read().strip())
+                )
+            except (OSError, ValueError):
+                batteries.append(BatteryState(name, 0.0, "Unknown"))
+        return batteries
+
+    @classmethod
+    def sample(cls) -> Snapshot:
+        snapshot = Snapshot()
+        previous = cls.snapshot
+
+        snapshot.mem_percent = parse_meminfo(cls.meminfo.read())
+
+        total, idle = parse_cpu_times(cls.stat.read())
+        last_total, last_idle = cls.cpu_times
+        # Without an earlier reading, the counters only give the average
+        # since boot.
+        if last_total and total > last_total:
+            busy = (total - last_total) - (idle - last_idle)
+            snapshot.cpu_percent = busy / (total - last_total) * 100
+        elif previous is not None:
+            snapshot.cpu_percent = previous.cpu_percent
+        cls.cpu_times = (total, idle)
+
+        snapshot.net_rates = cls.net_dev.sample()
+
+        now = time.monotonic()
+        if previous is None or now >= cls.battery_ttl:
+            snapshot.batteries = cls.sample_batteries()
+            cls.battery_ttl = now + cls.battery_update_interval
+        else:
+            snapshot.batteries = previous.batteries
+
+        return snapshot
+
+    @classmethod
+    def timed_sample(cls) -> Tuple[Snapshot, int]:
+        start_ns = time.perf_counter_ns()
+        snapshot = cls.sample()
+        return snapshot, time.perf_counter_ns() - start_ns
+
+    @classmethod
+    def publish(cls, result: Tuple[Snapshot, int]):
+        cls.snapshot, sample_ns = result
+
+        start_ns = time.perf_counter_ns()
+        for callback in list(cls.subscribers):
+            try:
+                callback(cls.snapshot)
+            except Exception:
+                logger.exception("SystemSampler subscriber failed.")
+
+        cls.last_tick_ns = sample_ns + time.perf_counter_ns() - start_ns
+        cls.total_tick_ns += cls.last_tick_ns
+        cls.ticks += 1
+
+    @classmethod
+    def tick(cls):
+        cls.timer = qtile.call_later(cls.update_interval, cls.tick)
+
+        if cls.use_executor:
+            cls.poller.submit(cls.timed_sample, cls.publish)
+            return
+
+        try:
+            cls.publish(cls.timed_sample())
+        except Exception:
+            logger.exception("SystemSampler failed to sample the system.")
+
+    @classmethod
+    def cost(cls) -> dict:
+        """
+        Get the time spent per tick reading the system metrics and updating
+        the subscribers, in milliseconds.
+        """
+        return {
+            "ticks": cls.ticks,
+            "last_ms": cls.last_tick_ns / 1e6,
+            "mean_ms": cls.total_tick_ns / cls.ticks / 1e6 if cls.ticks else 0.0,
+        }
@@ -0,0 +1,124 @@
+# --------------------------------------------------------------------
+# screengraph.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+A graph of which screen lies to the left, right, top, and bottom of each
+screen, built from the screens' geometry.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from libqtile import hook, qtile
+from libqtile.core.manager import Qtile
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+
+# --------------------------------------------------------------------
+class Rect(NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.height
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+
+# --------------------------------------------------------------------
+def overlap(a0: int, a1: int, b0: int, b1: int) -> int:
+    return max(0, min(a1, b1) - max(a0, b0))
+
+
+# --------------------------------------------------------------------
+def neighbor(rects: List[Rect], i: int, direction: str) -> Optional[int]:
+    """
+    Find the screen next to screen `i` in the given direction.
+
+    Only screens lying entirely beyond the edge of screen `i` in that
+    direction are considered.  Those which share a span of that edge are
+    preferred, nearest first and then by the length of the shared span.
+    Otherwise, e.g. for diagonal screens in an L-shaped layout, the screen
+    whose center is nearest is chosen.
+    """
+    a = rects[i]
+    ax, ay = a.center
+    best = None
+    best_key = None
+
+    for j, b in enumerate(rects):
+        if j == i:
+            continue
+        bx, by = b.center
+
+        if direction == "left":
+            ahead, gap, span = b.right <= a.x, a.x - b.right, overlap(a.y, a.bottom, b.y, b.bottom)
+        elif direction == "right":
+            ahead, gap, span = b.x >= a.right, b.x - a.right, overlap(a.y, a.bottom, b.y, b.bottom)
+        elif direction == "up":
+            ahead, gap, span = b.bottom <= a.y, a.y - b.bottom, overlap(a.x, a.right, b.x, b.right)
+        else:
+            ahead, gap, span = b.y >= a.bottom, b.y - a.bottom, overlap(a.x, a.right, b.x, b.right)
+
+        if not ahead:
+            continue
+
+        distance = (bx - ax) ** 2 + (by - ay) ** 2
+        key = (0, gap, -span) if span > 0 else (1, distance, 0)
+        if best_key is None or key < best_key:
+            best, best_key = j, key
+
+    return best
+
+
+# --------------------------------------------------------------------
+class ScreenGraph:
+    neighbors: List[Dict[str, Optional[int]]] = []
+
+    @classmethod
+    def build(cls, rects: List[Rect]):
+        cls.neighbors = [
+            {direction: neighbor(rects, i, direction) for direction in DIRECTIONS}
+            for i in range(len(rects))
+        ]
+
+    @classmethod
+    def rebuild(cls, qtile: Qtile):
+        cls.build([Rect(s.x, s.y, s.width, s.height) for s in qtile.screens])
+
+    @classmethod
+    def neighbor(cls, index: int, direction: str) -> Optional[int]:
+        """
+        Get the index of the screen next to the screen at `index` in the
+        given direction, or None if there isn't one.
+        """
+        if index >= len(cls.neighbors):
+            return None
+        return cls.neighbors[index][direction]
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def build_graph():
+            assert isinstance(qtile, Qtile)
+            cls.rebuild(qtile)
+
+        @hook.subscribe.screens_reconfigured
+        def on_screens_reconfigured():
+            assert isinstance(qtile, Qtile)
+            cls.rebuild(qtile)
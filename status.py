@@ -5,12 +5,16 @@
 # Date: Thursday July 27, 2023
 # --------------------------------------------------------------------
 
+import asyncio
+import heapq
 import threading
-from datetime import datetime
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Deque, Iterable, Optional
 
-from maths import secs
+from libqtile.log_utils import logger
+
+from timeutil import NEVER, now_ns, ns_to_sec, sec_to_ns
 
 
 # --------------------------------------------------------------------
@@ -21,29 +25,46 @@ MessageCallback = Callable[["Message"], str]
 @dataclass
 class Message:
     subject: str
-    callback: MessageCallback
+    callback: Optional[MessageCallback]
     display_sec: float
     update_sec: float
     content: str = "(empty)"
-    display_ttl: datetime = datetime.min
-    update_ttl: datetime = datetime.min
+    display_ttl: int = NEVER
+    update_ttl: int = 0
+    expiration: Optional[int] = None
 
-    def update(self, now: datetime) -> bool:
-        if self.display_ttl == datetime.min:
-            if self.display_sec > 0:
-                self.display_ttl = now + secs(self.display_sec)
-            else:
-                self.display_ttl = datetime.max
+    def reset(self, message_f: str | MessageCallback, display_sec: float, update_sec: float):
+        """
+        Reuse this message for a new `Status.show()` of the same subject.
+        Its display deadline is unset until the next `schedule()`.
+        """
+        if callable(message_f):
+            self.callback = message_f
+            self.update_ttl = 0
+        else:
+            self.callback = None
+            self.content = message_f
+            self.update_ttl = NEVER
+        self.display_sec = display_sec
+        self.update_sec = update_sec
+        self.display_ttl = 0
 
-        if self.display_ttl < now:
+    def schedule(self, now: int):
+        if self.display_sec > 0:
+            self.display_ttl = now + sec_to_ns(self.display_sec)
+        else:
+            self.display_ttl = NEVER
+
+    def update(self, now: int) -> bool:
+        if self.display_ttl <= now:
             return False
 
-        if self.update_ttl < now:
+        if self.update_ttl <= now and self.callback is not None:
             self.content = self.callback(self)
             if self.update_sec > 0:
-                self.update_ttl = now + secs(self.update_sec)
+                self.update_ttl = now + sec_to_ns(self.update_sec)
             else:
-                self.update_ttl = datetime.max
+                self.update_ttl = NEVER
 
         return True
 
@@ -54,6 +75,7 @@ class IdleMessage(Message):
         super().__init__("idle", self._print, 0, 0.05)
         self.animation = "/-\\|"
         self.offset = 0
+        self.content = self.animation[self.offset]
 
     def _print(self, msg: Message):
         self.offset = (self.offset + 1) % len(self.animation)
@@ -62,25 +84,164 @@ class IdleMessage(Message):
 
 # --------------------------------------------------------------------
 class Status:
+    """
+    A ticker of status messages, rotating between subjects every
+    `rotate_sec`.
+
+    Message expirations are kept in a heap and the rotation in a deque, so
+    an update only touches the messages which have expired and the one
+    being shown.  Both are maintained lazily: a message keeps at most one
+    entry in the heap, which is pushed back when it comes due if the
+    message was shown again in the meantime, and a subject in the rotation
+    is dropped when it reaches the front after its message has expired.
+
+    Messages may be shown from any thread.  The store is guarded by `lock`,
+    and listeners are always notified on the event loop in `loop` if one
+    is set.
+    """
+
     idle = IdleMessage()
     update_sec = 0.05
 
-    subjects: list[str] = []
     messages: dict[str, Message] = {}
-    offset = -1
+    subjects: Deque[str] = deque()
+    queued: set[str] = set()
+    expirations: list[tuple[int, str]] = []
+    unscheduled: dict[str, Message] = {}
     rotate_sec: float = 1.0
-    offset_ttl: datetime = datetime.min
-    lock = threading.Lock()
+    rotate_ttl: int = 0
+    lock = threading.RLock()
+    animate_idle = False
+    listeners: list[Callable[[], None]] = []
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    frame_sec = 1 / 60
+    pending = False
+
+    @classmethod
+    def subscribe(cls, listener: Callable[[], None]):
+        """
+        Register a function to be called whenever a new message is shown.
+        """
+        if listener not in cls.listeners:
+            cls.listeners.append(listener)
+
+    @classmethod
+    def unsubscribe(cls, listener: Callable[[], None]):
+        if listener in cls.listeners:
+            cls.listeners.remove(listener)
 
     @classmethod
-    def update_messages(cls, now: datetime):
-        dead_keys = [k for k, m in cls.messages.items() if not m.update(now)]
-        for key in dead_keys:
-            del cls.messages[key]
-        cls.subjects = [subj for subj in cls.subjects if subj in cls.messages]
+    def on_loop(cls) -> bool:
+        try:
+            return asyncio.get_running_loop() is cls.loop
+        except RuntimeError:
+            return False
+
+    @classmethod
+    def notify(cls):
+        """
+        Notify the listeners that a message was shown.  If `loop` is set,
+        notifications within the same frame are collapsed into one, which
+        is delivered on the loop.
+        """
+        if cls.loop is None:
+            for listener in list(cls.listeners):
+                listener()
+            return
+
+        with cls.lock:
+            if cls.pending:
+                return
+            cls.pending = True
+
+        if cls.on_loop():
+            cls.loop.call_later(cls.frame_sec, cls.flush)
+        else:
+            cls.loop.call_soon_threadsafe(cls.loop.call_later, cls.frame_sec, cls.flush)
 
-        if cls.offset >= len(cls.subjects):
-            cls.offset = len(cls.subjects) - 1
+    @classmethod
+    def flush(cls):
+        with cls.lock:
+            cls.pending = False
+        for listener in list(cls.listeners):
+            listener()
+
+    @classmethod
+    def schedule_messages(cls, now: int):
+        """
+        Set the display deadlines of the messages shown since the last
+        update, so that a burst of shows costs one deadline per subject.
+        A message whose deadline can't be computed is dropped.
+        """
+        for message in cls.unscheduled.values():
+            try:
+                message.schedule(now)
+            except (OverflowError, ValueError):
+                logger.warning(
+                    "Status: dropping message %r with display_sec %r",
+                    message.subject,
+                    message.display_sec,
+                )
+                cls.messages.pop(message.subject, None)
+                continue
+            if message.display_ttl == NEVER:
+                message.expiration = None
+            elif message.expiration is None or message.display_ttl < message.expiration:
+                message.expiration = message.display_ttl
+                heapq.heappush(cls.expirations, (message.display_ttl, message.subject))
+        cls.unscheduled.clear()
+
+    @classmethod
+    def expire_messages(cls, now: int):
+        while cls.expirations and cls.expirations[0][0] <= now:
+            deadline, subject = heapq.heappop(cls.expirations)
+            message = cls.messages.get(subject)
+            if message is None or message.expiration != deadline:
+                continue
+            if message.display_ttl <= now:
+                del cls.messages[subject]
+            else:
+                message.expiration = message.display_ttl
+                heapq.heappush(cls.expirations, (message.display_ttl, subject))
+
+    @classmethod
+    def next_expiration(cls) -> int:
+        while cls.expirations:
+            deadline, subject = cls.expirations[0]
+            message = cls.messages.get(subject)
+            if message is not None and message.expiration == deadline:
+                return deadline
+            heapq.heappop(cls.expirations)
+        return NEVER
+
+    @classmethod
+    def advance(cls):
+        """
+        Rotate to the next subject, dropping any expired subjects which
+        reach the front of the rotation.
+        """
+        cls.subjects.rotate(1)
+        while cls.subjects and cls.subjects[0] not in cls.messages:
+            cls.queued.discard(cls.subjects.popleft())
+            cls.subjects.rotate(1)
+
+    @classmethod
+    def _put(
+        cls,
+        subject: str,
+        message_f: str | MessageCallback,
+        display_sec: float,
+        update_sec: float,
+    ):
+        message = cls.messages.get(subject)
+        if message is None:
+            message = cls.messages[subject] = Message(subject, None, display_sec, update_sec)
+        message.reset(message_f, display_sec, update_sec)
+        cls.unscheduled[subject] = message
+
+        if subject not in cls.queued:
+            cls.queued.add(subject)
+            cls.subjects.append(subject)
 
     @classmethod
     def show(
@@ -90,26 +251,71 @@ class Status:
         display_sec=1.0,
         update_sec=0,
     ):
-        callback = message_f if callable(message_f) else (lambda m: str(message_f))
-        new_subject = subject not in cls.messages
-        cls.messages[subject] = Message(subject, callback, display_sec, update_sec)
-        if new_subject:
-            cls.subjects.append(subject)
+        with cls.lock:
+            cls._put(subject, message_f, display_sec, update_sec)
+        cls.notify()
+
+    @classmethod
+    def show_batch(cls, messages: Iterable[tuple[str, str, float]]):
+        """
+        Show several (subject, text, display_sec) messages at once, with a
+        single notification.
+        """
+        with cls.lock:
+            for subject, text, display_sec in messages:
+                cls._put(subject, text, display_sec, 0)
+        cls.notify()
 
     @classmethod
     def update(cls) -> str:
-        now = datetime.now()
-        cls.update_messages(now)
+        with cls.lock:
+            now = now_ns()
+            cls.schedule_messages(now)
+            cls.expire_messages(now)
 
-        if cls.subjects:
-            if cls.offset_ttl < now or cls.offset < 0:
-                cls.offset = (cls.offset + 1) % len(cls.subjects)
-                cls.offset_ttl = now + secs(cls.rotate_sec)
-            message = cls.messages[cls.subjects[cls.offset * -1]]
+            if cls.messages:
+                if cls.subjects[0] not in cls.messages:
+                    cls.advance()
+                    cls.rotate_ttl = now + sec_to_ns(cls.rotate_sec)
+                elif cls.rotate_ttl <= now:
+                    if cls.rotate_ttl != 0:
+                        cls.advance()
+                    cls.rotate_ttl = now + sec_to_ns(cls.rotate_sec)
+                message = cls.messages[cls.subjects[0]]
+                message.update(now)
 
-        else:
-            message = Status.idle
-            message.update(now)
-            cls.offset = -1
+            else:
+                message = Status.idle
+                if cls.animate_idle:
+                    message.update(now)
+                cls.subjects.clear()
+                cls.queued.clear()
+                cls.rotate_ttl = 0
+
+            return message.content
+
+    @classmethod
+    def next_update_sec(cls) -> Optional[float]:
+        """
+        Get the number of seconds until the text returned by `update()` can
+        next change on its own, or None if it will only change on the next
+        call to `show()`.
+        """
+        with cls.lock:
+            if cls.messages:
+                deadline = cls.next_expiration()
+                current = cls.messages.get(cls.subjects[0])
+                if current is not None:
+                    deadline = min(deadline, current.update_ttl)
+                if len(cls.messages) > 1:
+                    deadline = min(deadline, cls.rotate_ttl)
+
+            elif cls.animate_idle:
+                deadline = cls.idle.update_ttl
+
+            else:
+                return None
 
-        return message.content
+            if deadline == NEVER:
+                return None
+            return max(0.0, ns_to_sec(deadline - now_ns()))
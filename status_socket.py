@@ -0,0 +1,177 @@
+# --------------------------------------------------------------------
+# status_socket.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+A Unix domain socket which external scripts can use to show messages in
+the status ticker without going through the qtile command client.
+
+Each message is one line of tab separated fields:
+
+    subject<TAB>text[<TAB>display_sec]
+
+For example:
+
+    printf 'volume\t50%%\t2\n' | socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/qtile-status/status.sock
+"""
+
+import asyncio
+import math
+import os
+import socket
+import stat
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from libqtile import hook
+from libqtile.log_utils import logger
+
+from status import Status
+
+
+# --------------------------------------------------------------------
+def default_socket_path() -> Path:
+    """
+    The socket lives in a per-user directory which only that user can
+    access, so its own permissions don't matter.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "qtile-status" / "status.sock"
+    return Path(tempfile.gettempdir()) / f"qtile-status-{os.getuid()}" / "status.sock"
+
+
+# --------------------------------------------------------------------
+MAX_DISPLAY_SEC = 3600.0
+
+
+# --------------------------------------------------------------------
+def parse_line(line: str) -> Optional[Tuple[str, str, float]]:
+    """
+    Parse a message line into (subject, text, display_sec), or return None
+    if it is malformed.  `display_sec` must be a positive, finite number,
+    and is capped at `MAX_DISPLAY_SEC`.
+    """
+    fields = line.rstrip("\r\n").split("\t")
+    if len(fields) < 2 or not fields[0]:
+        return None
+    display_sec = 1.0
+    if len(fields) > 2:
+        try:
+            display_sec = float(fields[2])
+        except ValueError:
+            return None
+        if not math.isfinite(display_sec) or display_sec <= 0:
+            return None
+    return fields[0], fields[1], min(display_sec, MAX_DISPLAY_SEC)
+
+
+# --------------------------------------------------------------------
+class StatusSocket:
+    path = default_socket_path()
+    max_line = 4096
+    read_size = 65536
+    server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def parse_batch(cls, lines: List[bytes]) -> List[Tuple[str, str, float]]:
+        messages = []
+        for line in lines:
+            message = parse_line(line.decode("utf-8", errors="replace"))
+            if message is None:
+                logger.warning("StatusSocket: ignoring malformed message %r", line)
+                continue
+            messages.append(message)
+        return messages
+
+    @classmethod
+    async def handle_client(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Read messages until the writer hangs up.  All of the complete lines
+        received in one read are shown as a single batch.
+        """
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(cls.read_size)
+                if not data:
+                    break
+                *lines, buffer = (buffer + data).split(b"\n")
+                if len(buffer) > cls.max_line:
+                    logger.warning("StatusSocket: message too long, closing connection.")
+                    buffer = b""
+                    break
+                messages = cls.parse_batch(lines)
+                if messages:
+                    Status.show_batch(messages)
+
+            if buffer:
+                messages = cls.parse_batch([buffer])
+                if messages:
+                    Status.show_batch(messages)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    @classmethod
+    def make_private_dir(cls):
+        """
+        Create the directory holding the socket, which must be a directory
+        owned by the current user and inaccessible to anyone else.
+        """
+        path = cls.path.parent
+        path.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+            raise PermissionError(f"{path} is not a directory owned by the current user")
+        if stat.S_IMODE(st.st_mode) & 0o077:
+            os.chmod(path, 0o700)
+
+    @classmethod
+    async def start(cls):
+        sock = None
+        try:
+            cls.make_private_dir()
+            # Remove a socket left behind by a previous session.
+            if cls.path.is_socket():
+                cls.path.unlink()
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(str(cls.path))
+            os.chmod(cls.path, 0o600)
+            cls.server = await asyncio.start_unix_server(cls.handle_client, sock=sock)
+        except OSError:
+            logger.exception("StatusSocket: failed to listen on %s", cls.path)
+            if sock is not None:
+                sock.close()
+            cls.server = None
+
+    @classmethod
+    def stop(cls):
+        if cls.server is None:
+            return
+        cls.server.close()
+        cls.server = None
+        try:
+            cls.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def start_listening():
+            if cls.server is None:
+                asyncio.ensure_future(cls.start())
+
+        @hook.subscribe.shutdown
+        def stop_listening():
+            cls.stop()
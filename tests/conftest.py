@@ -0,0 +1,71 @@
+# --------------------------------------------------------------------
+# conftest.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Makes the config modules importable from the tests, with a minimal
+stand-in for libqtile if it isn't installed.
+"""
+
+import logging
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# --------------------------------------------------------------------
+class Subscriptions:
+    def __getattr__(self, name):
+        return lambda f: f
+
+
+# --------------------------------------------------------------------
+class Match:
+    """
+    The parts of `libqtile.config.Match` used by `rules.RuleIndex`.
+    """
+
+    def __init__(self, **rules):
+        self._rules = rules
+
+    def compare(self, client) -> bool:
+        values = {
+            "wm_class": client.get_wm_class() or [],
+            "title": [client.name],
+            "wm_type": [client.get_wm_type()],
+        }
+        for prop, rule in self._rules.items():
+            if isinstance(rule, str):
+                matched = any(v is not None and v in rule for v in values[prop])
+            else:
+                matched = any(v is not None and rule.match(v) for v in values[prop])
+            if not matched:
+                return False
+        return True
+
+
+# --------------------------------------------------------------------
+def install_fakes():
+    def module(name, **attrs):
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        sys.modules.setdefault(name, mod)
+
+    module("libqtile", hook=types.SimpleNamespace(subscribe=Subscriptions()), qtile=None)
+    module("libqtile.log_utils", logger=logging.getLogger("libqtile"))
+    module("libqtile.config", Match=Match)
+    module("libqtile.backend")
+    module("libqtile.backend.base", Window=object)
+
+
+try:
+    import libqtile  # noqa: F401
+except ImportError:
+    install_fakes()
@@ -0,0 +1,152 @@
+# --------------------------------------------------------------------
+# test_netlink.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Tests for the netlink monitors, fed recorded datagrams through a stand-in
+socket.
+"""
+
+import errno
+
+import pytest
+
+from netlink import (
+    RTM_NEWADDR,
+    RTM_NEWLINK,
+    NetlinkMonitor,
+    UeventMonitor,
+    parse_message_types,
+    parse_uevent,
+)
+
+# RTM_NEWLINK for wlp2s0 coming up.
+NEWLINK = (
+    b"4\x00\x00\x00\x10\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x01\x00\x03\x00\x00\x00C\x10\x01\x00\xff\xff\xff\xff"
+    b"\x0b\x00\x03\x00wlp2s0\x00\x00\x08\x00\x04\x00\xdc\x05\x00\x00"
+)
+
+# RTM_NEWADDR for 192.168.1.23/24 on wlp2s0.
+NEWADDR = (
+    b"4\x00\x00\x00\x14\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x02\x18\x00\x00\x03\x00\x00\x00\x08\x00\x01\x00\xc0\xa8\x01\x17"
+    b"\x08\x00\x02\x00\xc0\xa8\x01\x17\x0b\x00\x03\x00wlp2s0\x00\x00"
+)
+
+# NLMSG_DONE, ending a multipart dump.
+DONE = b"\x14\x00\x00\x00\x03\x00\x02\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+
+# A battery being plugged in, and an unrelated device being bound.
+BATTERY_ADD = (
+    b"add@/devices/LNXSYSTM:00/LNXSYBUS:00/PNP0C0A:00/power_supply/BAT1\0"
+    b"ACTION=add\0DEVPATH=/devices/LNXSYSTM:00/LNXSYBUS:00/PNP0C0A:00/power_supply/BAT1\0"
+    b"SUBSYSTEM=power_supply\0POWER_SUPPLY_NAME=BAT1\0SEQNUM=4127\0"
+)
+USB_BIND = (
+    b"bind@/devices/pci0000:00/0000:00:14.0/usb1/1-2\0"
+    b"ACTION=bind\0DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-2\0"
+    b"SUBSYSTEM=usb\0DEVTYPE=usb_device\0SEQNUM=4128\0"
+)
+
+
+# --------------------------------------------------------------------
+class RecordedSocket:
+    """
+    Replays recorded datagrams, or exceptions to raise, then raises
+    `BlockingIOError` once drained.
+    """
+
+    def __init__(self, *datagrams):
+        self.datagrams = list(datagrams)
+
+    def recv(self, size: int) -> bytes:
+        if not self.datagrams:
+            raise BlockingIOError()
+        data = self.datagrams.pop(0)
+        if isinstance(data, Exception):
+            raise data
+        return data[:size]
+
+    def fileno(self) -> int:
+        return -1
+
+
+# --------------------------------------------------------------------
+def monitor(cls, *datagrams, **kwargs):
+    calls = []
+    return cls(lambda: calls.append(1), sock=RecordedSocket(*datagrams), **kwargs), calls
+
+
+# --------------------------------------------------------------------
+def test_parse_message_types():
+    assert parse_message_types(NEWLINK) == [RTM_NEWLINK]
+    assert parse_message_types(NEWADDR) == [RTM_NEWADDR]
+
+
+def test_parse_multipart():
+    assert parse_message_types(NEWLINK + NEWADDR + DONE) == [RTM_NEWLINK, RTM_NEWADDR, 3]
+
+
+@pytest.mark.parametrize("cut", [1, 15, 16, 20, len(NEWADDR) - 1])
+def test_parse_truncated(cut):
+    assert parse_message_types(NEWLINK + NEWADDR[:cut]) == [RTM_NEWLINK]
+    assert parse_message_types(NEWADDR[:cut]) == []
+
+
+def test_parse_bad_length():
+    assert parse_message_types(b"\x04" + NEWLINK[1:]) == []
+
+
+# --------------------------------------------------------------------
+def test_events_are_batched():
+    m, calls = monitor(NetlinkMonitor, NEWLINK, NEWADDR, NEWLINK + NEWADDR + DONE)
+    m.on_readable()
+    assert calls == [1]
+
+
+def test_non_events_are_ignored():
+    m, calls = monitor(NetlinkMonitor, DONE, NEWADDR[:20], b"")
+    m.on_readable()
+    assert calls == []
+
+
+def test_overrun_counts_as_event():
+    m, calls = monitor(NetlinkMonitor, OSError(errno.ENOBUFS, "No buffer space available"))
+    m.on_readable()
+    assert calls == [1]
+
+
+def test_other_errors_propagate():
+    m, _ = monitor(NetlinkMonitor, OSError(errno.EBADF, "Bad file descriptor"))
+    with pytest.raises(OSError):
+        m.on_readable()
+
+
+# --------------------------------------------------------------------
+def test_parse_uevent():
+    event = parse_uevent(BATTERY_ADD)
+    assert event["ACTION"] == "add"
+    assert event["SUBSYSTEM"] == "power_supply"
+    assert event["POWER_SUPPLY_NAME"] == "BAT1"
+
+
+def test_parse_truncated_uevent():
+    event = parse_uevent(BATTERY_ADD[: BATTERY_ADD.index(b"SUBSYSTEM") + 4])
+    assert event["ACTION"] == "add"
+    assert "SUBSYSTEM" not in event
+
+
+def test_uevent_filter():
+    m, calls = monitor(UeventMonitor, USB_BIND, subsystem="power_supply")
+    m.on_readable()
+    assert calls == []
+
+    m, calls = monitor(UeventMonitor, USB_BIND, BATTERY_ADD, BATTERY_ADD, subsystem="power_supply")
+    m.on_readable()
+    assert calls == [1]
@@ -0,0 +1,83 @@
+# --------------------------------------------------------------------
+# test_procfs.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+import pytest
+
+import procfs
+from procfs import NetDevRates, ProcFile, format_rate, parse_net_dev
+
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:  104776     982    0    0    0     0          0         0   104776     982    0    0    0     0       0          0
+enp3s0: 8812312   10210    0    0    0     0          0       112  1322101    7707    0    0    0     0       0          0
+wlp2s0:       0       0    0    0    0     0          0         0        0       0    0    0    0     0       0          0
+"""
+
+
+# --------------------------------------------------------------------
+def test_parse_net_dev():
+    assert parse_net_dev(NET_DEV) == {
+        "lo": (104776, 104776),
+        "enp3s0": (8812312, 1322101),
+        "wlp2s0": (0, 0),
+    }
+
+
+def test_parse_net_dev_skips_short_lines():
+    assert parse_net_dev(NET_DEV + "bogus: 1 2 3\n")["enp3s0"] == (8812312, 1322101)
+    assert "bogus" not in parse_net_dev(NET_DEV + "bogus: 1 2 3\n")
+
+
+# --------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "rate, text",
+    [
+        (0, "0B"),
+        (999, "999B"),
+        (1000, "1.0K"),
+        (1536, "1.5K"),
+        (5 * 1024**2, "5.0M"),
+        (2 * 1024**3, "2.0G"),
+        (1000 * 1024**3, "1.0T"),
+        (2 * 1024**4, "2.0T"),
+        (2000 * 1024**4, "2000.0T"),
+    ],
+)
+def test_format_rate(rate, text):
+    assert format_rate(rate) == text
+
+
+# --------------------------------------------------------------------
+def test_proc_file_rereads(tmp_path):
+    path = tmp_path / "value"
+    path.write_text("1\n")
+    f = ProcFile(str(path))
+    assert f.read() == "1\n"
+    path.write_text("22\n")
+    assert f.read() == "22\n"
+    f.close()
+
+
+def test_net_dev_rates(tmp_path, monkeypatch):
+    path = tmp_path / "dev"
+    path.write_text(NET_DEV)
+    clock = iter([10.0, 12.0])
+    monkeypatch.setattr(procfs.time, "monotonic", lambda: next(clock))
+
+    rates = NetDevRates(str(path))
+    assert rates.sample() == {}
+
+    path.write_text(NET_DEV.replace("8812312", "8814360").replace(" 104776 ", "    100 "))
+    assert rates.sample() == {
+        "lo": (0.0, 0.0),
+        "enp3s0": (1024.0, 0.0),
+        "wlp2s0": (0.0, 0.0),
+    }
+    rates.close()
@@ -0,0 +1,80 @@
+# --------------------------------------------------------------------
+# test_rules.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+import re
+
+from libqtile.config import Match
+
+from rules import RuleIndex, scoped_pattern
+
+
+# --------------------------------------------------------------------
+class Client:
+    def __init__(self, wm_class=(), name=None, wm_type="normal"):
+        self.wm_class = list(wm_class)
+        self.name = name
+        self.wm_type = wm_type
+
+    def get_wm_class(self):
+        return self.wm_class
+
+    def get_wm_type(self):
+        return self.wm_type
+
+
+# --------------------------------------------------------------------
+def test_scoped_pattern():
+    assert scoped_pattern(re.compile("mpv")) == "(?:mpv)"
+    assert scoped_pattern(re.compile("(?i)mpv")) == "(?i:mpv)"
+    assert scoped_pattern(re.compile("(?s)(?i)a.b")) == "(?is:a.b)"
+    assert scoped_pattern(re.compile("mpv", re.IGNORECASE)) == "(?i:mpv)"
+
+
+def test_strings_match_exactly():
+    rules = [Match(wm_class="pinentry"), Match(title="Picture-in-Picture")]
+    index = RuleIndex().add("float", rules)
+    assert index.classify(Client(["pinentry", "Pinentry"])) == {"float"}
+    assert index.classify(Client(name="Picture-in-Picture")) == {"float"}
+    assert index.classify(Client(["pin"])) == set()
+
+
+def test_inline_flags_stay_scoped():
+    index = RuleIndex().add(
+        "media",
+        [
+            Match(wm_class=re.compile("(?i)mpv")),
+            Match(wm_class=re.compile("vlc")),
+            Match(title=re.compile("(?x) youtube  # a comment")),
+        ],
+    )
+    assert "media" in index.compiled["wm_class"]
+    assert index.matches(Client(["MPV"]), "media")
+    assert index.matches(Client(["vlc"]), "media")
+    assert not index.matches(Client(["VLC"]), "media")
+    assert index.matches(Client(name="youtube - Firefox"), "media")
+
+
+def test_tags_are_independent():
+    index = RuleIndex()
+    index.add("float", [Match(wm_type="dialog"), Match(wm_class=re.compile("(?i)gimp"))])
+    index.add("media", [Match(wm_class=re.compile("mpv"))])
+    assert index.classify(Client(["Gimp"], wm_type="dialog")) == {"float"}
+    assert index.classify(Client(["mpv"])) == {"media"}
+
+
+def test_unindexable_rules_fall_back():
+    rules = [
+        Match(wm_class="firefox", title="Library"),
+        Match(title=re.compile(r"(\w+) - \1")),
+    ]
+    index = RuleIndex().add("float", rules)
+    assert len(index.fallback["float"]) == 2
+    assert index.matches(Client(["firefox"], name="Library"), "float")
+    assert index.matches(Client(name="echo - echo"), "float")
+    assert not index.matches(Client(["firefox"], name="Mozilla Firefox"), "float")
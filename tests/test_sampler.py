@@ -0,0 +1,57 @@
+# --------------------------------------------------------------------
+# test_sampler.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+import types
+
+import pytest
+
+import sampler
+from sampler import Snapshot, SystemSampler
+
+
+# --------------------------------------------------------------------
+class Timer:
+    def cancel(self):
+        pass
+
+
+@pytest.fixture
+def samples(monkeypatch):
+    taken = []
+
+    def sample():
+        taken.append(Snapshot(mem_percent=len(taken)))
+        return taken[-1]
+
+    fake_qtile = types.SimpleNamespace(call_later=lambda *_: Timer())
+    monkeypatch.setattr(sampler, "qtile", fake_qtile)
+    monkeypatch.setattr(SystemSampler, "use_executor", False)
+    monkeypatch.setattr(SystemSampler, "sample", sample)
+    monkeypatch.setattr(SystemSampler, "subscribers", [])
+    monkeypatch.setattr(SystemSampler, "snapshot", None)
+    monkeypatch.setattr(SystemSampler, "timer", None)
+    return taken
+
+
+# --------------------------------------------------------------------
+def test_subscriber_gets_latest_snapshot_while_running(samples):
+    first, second = [], []
+    SystemSampler.subscribe(first.append)
+    SystemSampler.subscribe(second.append)
+    assert len(samples) == 1
+    assert second == [samples[0]]
+
+
+def test_resume_takes_a_fresh_sample(samples):
+    seen = []
+    SystemSampler.subscribe(seen.append)
+    SystemSampler.unsubscribe(seen.append)
+    SystemSampler.subscribe(seen.append)
+    assert seen == samples
+    assert [s.mem_percent for s in seen] == [0, 1]
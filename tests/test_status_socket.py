@@ -0,0 +1,79 @@
+# --------------------------------------------------------------------
+# test_status_socket.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+import asyncio
+import math
+import os
+import stat
+
+import pytest
+
+from status import Status
+from status_socket import MAX_DISPLAY_SEC, StatusSocket, parse_line
+
+
+# --------------------------------------------------------------------
+def test_parse_line():
+    assert parse_line("volume\t50%\n") == ("volume", "50%", 1.0)
+    assert parse_line("volume\t50%\t2.5\r\n") == ("volume", "50%", 2.5)
+    assert parse_line(f"volume\t50%\t{MAX_DISPLAY_SEC * 10}") == ("volume", "50%", MAX_DISPLAY_SEC)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "",
+        "volume",
+        "\t50%",
+        "volume\t50%\tsoon",
+        "volume\t50%\tinf",
+        "volume\t50%\tnan",
+        "volume\t50%\t0",
+        "volume\t50%\t-1",
+    ],
+)
+def test_parse_line_rejects(line):
+    assert parse_line(line) is None
+
+
+# --------------------------------------------------------------------
+def test_bad_display_sec_is_dropped():
+    Status.show_batch([("volume", "hello", math.inf), ("brightness", "50%", 1.0)])
+    assert Status.update() == "50%"
+    assert "volume" not in Status.messages
+    assert Status.update() == "50%"
+
+
+# --------------------------------------------------------------------
+def test_socket_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(StatusSocket, "path", tmp_path / "status" / "status.sock")
+
+    async def start_and_send():
+        await StatusSocket.start()
+        try:
+            assert StatusSocket.server is not None
+            _, writer = await asyncio.open_unix_connection(str(StatusSocket.path))
+            writer.write(b"socket\thello\t1\n")
+            await writer.drain()
+            writer.close()
+            await asyncio.sleep(0.1)
+        finally:
+            StatusSocket.stop()
+
+    asyncio.run(start_and_send())
+    assert stat.S_IMODE(os.stat(tmp_path / "status").st_mode) == 0o700
+    assert Status.messages["socket"].content == "hello"
+
+
+def test_directory_at_socket_path_fails_cleanly(tmp_path, monkeypatch):
+    (tmp_path / "status").mkdir()
+    (tmp_path / "status" / "status.sock").mkdir()
+    monkeypatch.setattr(StatusSocket, "path", tmp_path / "status" / "status.sock")
+    asyncio.run(StatusSocket.start())
+    assert StatusSocket.server is None
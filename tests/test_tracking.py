@@ -0,0 +1,171 @@
+# --------------------------------------------------------------------
+# test_tracking.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Tests for FloatIndex, driving its hooks in the order Qtile fires them:
+`group_window_add` first, then the window's group and float state are
+assigned, then `client_managed`.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# --------------------------------------------------------------------
+class FakeHooks:
+    def __init__(self):
+        self.handlers = {}
+
+    def __getattr__(self, name):
+        def subscribe(f):
+            self.handlers.setdefault(name, []).append(f)
+            return f
+
+        return subscribe
+
+    def fire(self, name, *args):
+        for f in self.handlers.get(name, []):
+            f(*args)
+
+
+# --------------------------------------------------------------------
+class FakeQtile:
+    def __init__(self):
+        self.groups = []
+        self.current_group = None
+        self.current_window = None
+
+
+# --------------------------------------------------------------------
+class FakeGroup:
+    def __init__(self, name):
+        self.name = name
+        self.windows = []
+
+    def add(self, window, float_rule=False):
+        hooks.fire("group_window_add", self, window)
+        if window.group is not None:
+            window.group.windows.remove(window)
+        window.group = self
+        self.windows.append(window)
+        if float_rule:
+            # Float rules set the float state directly, without firing
+            # `float_change`.
+            window.floating = True
+
+
+# --------------------------------------------------------------------
+class FakeWindow:
+    def __init__(self, wid):
+        self.wid = wid
+        self.group = None
+        self.floating = False
+
+    def manage(self, group, float_rule=False):
+        group.add(self, float_rule)
+        hooks.fire("client_managed", self)
+
+    def togroup(self, group):
+        group.add(self)
+
+    def toggle_floating(self):
+        self.floating = not self.floating
+        hooks.fire("float_change")
+
+
+# --------------------------------------------------------------------
+hooks = FakeHooks()
+fake_qtile = FakeQtile()
+
+
+def install_fakes():
+    def module(name, **attrs):
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        sys.modules[name] = mod
+
+    module("libqtile", hook=types.SimpleNamespace(subscribe=hooks), qtile=fake_qtile)
+    module("libqtile.backend")
+    module("libqtile.backend.base", Window=FakeWindow)
+    module("libqtile.config", Group=FakeGroup)
+    module("libqtile.core")
+    module("libqtile.core.manager", Qtile=FakeQtile)
+
+
+install_fakes()
+sys.modules.pop("tracking", None)
+from tracking import FloatIndex  # noqa: E402
+
+FloatIndex.setup_hooks()
+
+
+# --------------------------------------------------------------------
+@pytest.fixture
+def groups():
+    FloatIndex.groups.clear()
+    FloatIndex.pending.clear()
+    fake_qtile.groups = [FakeGroup("a"), FakeGroup("b")]
+    fake_qtile.current_group = fake_qtile.groups[0]
+    fake_qtile.current_window = None
+    hooks.fire("startup_complete")
+    return fake_qtile.groups
+
+
+def wids(windows):
+    return sorted(w.wid for w in windows)
+
+
+# --------------------------------------------------------------------
+def test_rule_floated_window_is_indexed(groups):
+    a, _ = groups
+    FakeWindow(1).manage(a, float_rule=True)
+    FakeWindow(2).manage(a)
+    assert wids(FloatIndex.floating(a)) == [1]
+
+
+def test_window_moved_to_another_group(groups):
+    a, b = groups
+    window = FakeWindow(1)
+    window.manage(a, float_rule=True)
+    assert wids(FloatIndex.floating(a)) == [1]
+
+    window.togroup(b)
+    assert wids(FloatIndex.floating(a)) == []
+    assert wids(FloatIndex.floating(b)) == [1]
+
+
+def test_float_toggled_outside_current_group(groups, monkeypatch):
+    a, b = groups
+    window = FakeWindow(1)
+    window.manage(b)
+    FakeWindow(2).manage(b)
+    assert wids(FloatIndex.floating(b)) == []
+
+    # Toggling re-indexes just the current window, without a rescan.
+    monkeypatch.setattr(FloatIndex, "rebuild", None)
+    fake_qtile.current_window = window
+    window.toggle_floating()
+    assert wids(FloatIndex.floating(b)) == [1]
+
+    window.toggle_floating()
+    assert wids(FloatIndex.floating(b)) == []
+
+
+def test_killed_window_is_dropped(groups):
+    a, _ = groups
+    window = FakeWindow(1)
+    window.manage(a, float_rule=True)
+    hooks.fire("client_killed", window)
+    a.windows.remove(window)
+    assert wids(FloatIndex.floating(a)) == []
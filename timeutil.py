@@ -6,7 +6,61 @@
 # --------------------------------------------------------------------
 
 import time
+from typing import Callable, Optional
+
+NS_PER_SEC = 1_000_000_000
+NEVER = 2**63 - 1
+
+ClockSource = Callable[[], int]
+
+_clock: ClockSource = time.monotonic_ns
+
 
 # --------------------------------------------------------------------
 def get_millis() -> int:
     return int(round(time.time() * 1000))
+
+
+# --------------------------------------------------------------------
+def now_ns() -> int:
+    """
+    Get the current monotonic time in nanoseconds, from the fake clock if
+    one has been set with `set_clock()`.
+    """
+    return _clock()
+
+
+# --------------------------------------------------------------------
+def set_clock(clock: Optional[ClockSource]):
+    """
+    Replace the clock used by `now_ns()`, or restore the monotonic clock
+    if `clock` is None.
+    """
+    global _clock
+    _clock = time.monotonic_ns if clock is None else clock
+
+
+# --------------------------------------------------------------------
+def sec_to_ns(sec: float) -> int:
+    return int(sec * NS_PER_SEC)
+
+
+# --------------------------------------------------------------------
+def ns_to_sec(ns: int) -> float:
+    return ns / NS_PER_SEC
+
+
+# --------------------------------------------------------------------
+class FakeClock:
+    """
+    A clock which only moves when told to, for use with `set_clock()`.
+    """
+
+    def __init__(self, start_ns: int = NS_PER_SEC):
+        self.ns = start_ns
+
+    def __call__(self) -> int:
+        return self.ns
+
+    def advance(self, sec: float):
+        self.ns += sec_to_ns(sec)
@@ -0,0 +1,172 @@
+# --------------------------------------------------------------------
+# tracking.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Per-group indexes of windows, kept current by hooks so that helpers don't
+have to scan every window in a group.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from libqtile import hook, qtile
+from libqtile.backend.base import Window
+from libqtile.config import Group
+from libqtile.core.manager import Qtile
+
+
+# --------------------------------------------------------------------
+class FloatIndex:
+    """
+    Tracks the floating windows of each group.
+
+    Qtile fires `group_window_add` before the window's group and float state
+    are assigned, so windows added to a group are held as pending and only
+    checked the next time that group is queried.  `float_change` doesn't say
+    which window changed, so only the current window, which the float
+    commands act on, is re-indexed; windows changed by other code should be
+    passed to `update()`.  Entries are also validated lazily: a window which
+    has since been tiled or moved to another group is dropped the next time
+    its group is queried.
+    """
+
+    groups: Dict[str, Dict[int, Window]] = {}
+    pending: Dict[str, Dict[int, Window]] = {}
+
+    @classmethod
+    def update(cls, window: Window):
+        group = window.group
+        if group is None:
+            return
+        if window.floating:
+            cls.groups.setdefault(group.name, {})[window.wid] = window
+        else:
+            cls.groups.get(group.name, {}).pop(window.wid, None)
+
+    @classmethod
+    def add(cls, group: Group, window: Window):
+        cls.pending.setdefault(group.name, {})[window.wid] = window
+
+    @classmethod
+    def remove(cls, window: Window):
+        for windows in (*cls.groups.values(), *cls.pending.values()):
+            windows.pop(window.wid, None)
+
+    @classmethod
+    def rebuild(cls, group: Group):
+        cls.pending.pop(group.name, None)
+        cls.groups[group.name] = {w.wid: w for w in group.windows if w.floating}
+
+    @classmethod
+    def floating(cls, group: Group) -> List[Window]:
+        """
+        Get the floating windows in the given group.
+        """
+        for window in cls.pending.pop(group.name, {}).values():
+            cls.update(window)
+
+        windows = cls.groups.get(group.name, {})
+        stale = [wid for wid, w in windows.items() if w.group is not group or not w.floating]
+        for wid in stale:
+            del windows[wid]
+        return list(windows.values())
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def index_floats():
+            assert isinstance(qtile, Qtile)
+            for group in qtile.groups:
+                cls.rebuild(group)
+
+        @hook.subscribe.group_window_add
+        def on_window_added(group: Group, window: Window):
+            cls.add(group, window)
+
+        @hook.subscribe.client_managed
+        def on_window_managed(window: Window):
+            cls.update(window)
+
+        @hook.subscribe.client_killed
+        def on_window_close(window: Window):
+            cls.remove(window)
+
+        @hook.subscribe.float_change
+        def on_float_change():
+            assert isinstance(qtile, Qtile)
+            if qtile.current_window is not None:
+                cls.update(qtile.current_window)
+
+
+# --------------------------------------------------------------------
+class TiledMRU:
+    """
+    Tracks the non-floating windows of each group, most recently focused
+    last.
+
+    As with `FloatIndex`, entries are validated lazily: windows which have
+    been floated or moved to another group are dropped when they are
+    reached by `last()`, and re-added the next time they are focused.
+    """
+
+    groups: Dict[str, "OrderedDict[int, Window]"] = {}
+
+    @classmethod
+    def touch(cls, window: Window):
+        group = window.group
+        if group is None or window.floating:
+            return
+        stack = cls.groups.setdefault(group.name, OrderedDict())
+        stack[window.wid] = window
+        stack.move_to_end(window.wid)
+
+    @classmethod
+    def remove(cls, window: Window):
+        for stack in cls.groups.values():
+            stack.pop(window.wid, None)
+
+    @classmethod
+    def last(cls, group: Group, exclude: Iterable[Optional[Window]] = ()) -> Optional[Window]:
+        """
+        Get the most recently focused non-floating window in the group,
+        skipping any windows in `exclude`.
+        """
+        stack = cls.groups.get(group.name)
+        if not stack:
+            return None
+
+        stale = []
+        found = None
+        for wid, window in reversed(stack.items()):
+            if window.group is not group or window.floating:
+                stale.append(wid)
+            elif not any(window is w for w in exclude):
+                found = window
+                break
+
+        for wid in stale:
+            del stack[wid]
+        return found
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def seed_from_focus_history():
+            assert isinstance(qtile, Qtile)
+            for group in qtile.groups:
+                for window in group.focus_history:
+                    cls.touch(window)
+
+        @hook.subscribe.client_focus
+        def on_focus(window: Window):
+            cls.touch(window)
+
+        @hook.subscribe.client_killed
+        def on_window_close(window: Window):
+            cls.remove(window)
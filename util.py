@@ -11,7 +11,10 @@ import time
 
 from libqtile.core.manager import Qtile
 
+from frames import Deltas, FrameAccumulator
 from media import MediaContainer
+from screengraph import ScreenGraph
+from tracking import FloatIndex
 
 
 # --------------------------------------------------------------------
@@ -29,13 +32,23 @@ def toggle_focus_floating(qtile: Qtile):
             break
 
 
+# --------------------------------------------------------------------
+def apply_opacity(qtile: Qtile, deltas: Deltas):
+    if qtile.current_window is None:
+        return
+    opacity = qtile.current_window.opacity + deltas["opacity"]
+    opacity = max(0.1, min(1.0, opacity))
+    qtile.current_window.opacity = opacity
+
+
+opacity_adjustments = FrameAccumulator(apply_opacity)
+
+
 # --------------------------------------------------------------------
 def adjust_opacity(delta: float):
     def _adjust_opacity(qtile: Qtile):
         assert qtile.current_window is not None
-        opacity = qtile.current_window.opacity + delta
-        opacity = max(0.1, min(1.0, opacity))
-        qtile.current_window.opacity = opacity
+        opacity_adjustments.add(qtile, "opacity", delta)
 
     return _adjust_opacity
 
@@ -45,9 +58,8 @@ def floats_to_front(qtile: Qtile):
     """
     Bring all floating windows of the group to front
     """
-    for window in qtile.current_group.windows:
-        if window.floating:
-            window.cmd_bring_to_front()
+    for window in FloatIndex.floating(qtile.current_group):
+        window.cmd_bring_to_front()
 
 
 # --------------------------------------------------------------------
@@ -56,9 +68,10 @@ def ground_all_floats(qtile: Qtile):
     Bring all floating windows in the current group back into
     the tiling layout.
     """
-    for window in qtile.current_group.windows:
-        if window.floating and window is not MediaContainer.window:
+    for window in FloatIndex.floating(qtile.current_group):
+        if window is not MediaContainer.window:
             window.toggle_floating()
+            FloatIndex.update(window)
 
 
 # --------------------------------------------------------------------
@@ -81,3 +94,22 @@ def window_to_next_screen(qtile: Qtile, switch_group=False, switch_screen=False)
         qtile.current_window.togroup(group, switch_group=switch_group)
         if switch_screen is True:
             qtile.cmd_to_screen(i + 1)
+
+
+# --------------------------------------------------------------------
+def window_to_screen(direction: str, switch_group=False, switch_screen=False):
+    """
+    Move the current window to the screen in the given direction, one of
+    "left", "right", "up" or "down", according to the screens' geometry.
+    """
+
+    def _window_to_screen(qtile: Qtile):
+        assert qtile.current_window is not None
+        i = ScreenGraph.neighbor(qtile.current_screen.index, direction)
+        if i is not None:
+            group = qtile.screens[i].group.name
+            qtile.current_window.togroup(group, switch_group=switch_group)
+            if switch_screen is True:
+                qtile.cmd_to_screen(i)
+
+    return _window_to_screen
@@ -0,0 +1,117 @@
+# --------------------------------------------------------------------
+# visibility.py
+#
+# Author: Lain Musgrove (lain.proliant@gmail.com)
+# Date: Saturday October 17, 2026
+#
+# Distributed under terms of the MIT license.
+# --------------------------------------------------------------------
+
+"""
+Suspends the timers of widgets which can't currently be seen, either
+because their bars are hidden or because the displays are powered off.
+"""
+
+from libqtile import bar, hook, qtile
+from libqtile.core.manager import Qtile
+from libqtile.log_utils import logger
+
+
+# --------------------------------------------------------------------
+def suspend_widget(widget):
+    """
+    Suspend a widget which supports it, see e.g.
+    `widget.SuspendablePollMixin`.  Other widgets keep running.
+    """
+    if hasattr(widget, "suspend"):
+        widget.suspend()
+
+
+# --------------------------------------------------------------------
+def resume_widget(widget):
+    """
+    Resume a suspended widget, refreshing it immediately to catch up.
+    """
+    if hasattr(widget, "resume"):
+        widget.resume()
+
+
+# --------------------------------------------------------------------
+class Visibility:
+    dpms_check_sec = 5.0
+    display_on = True
+    suspended: dict[int, object] = {}
+
+    @classmethod
+    def query_display_on(cls, qtile: Qtile) -> bool:
+        if qtile.core.name != "x11":
+            return True
+        try:
+            import xcffib.dpms
+
+            conn = qtile.core.conn.conn
+            info = conn(xcffib.dpms.key).Info().reply()
+            return not info.state or info.power_level == xcffib.dpms.DPMSMode.On
+        except Exception:
+            return True
+
+    @classmethod
+    def widget_bars(cls, widget) -> list:
+        return [widget.bar, *(m.bar for m in getattr(widget, "_mirrors", ()))]
+
+    @classmethod
+    def refresh(cls, qtile: Qtile):
+        """
+        Suspend the widgets which aren't visible on any bar, and resume the
+        ones which have become visible again.
+        """
+        widgets = {}
+        for screen in qtile.screens:
+            for gap in screen.gaps:
+                if isinstance(gap, bar.Bar):
+                    for widget in gap.widgets:
+                        widget = getattr(widget, "reflects", widget)
+                        widgets[id(widget)] = widget
+
+        for key, widget in widgets.items():
+            visible = cls.display_on and any(
+                b.is_show() for b in cls.widget_bars(widget) if b is not None
+            )
+            if visible and key in cls.suspended:
+                del cls.suspended[key]
+                resume_widget(widget)
+            elif not visible and key not in cls.suspended:
+                cls.suspended[key] = widget
+                suspend_widget(widget)
+
+        # Forget widgets which are no longer on any bar.
+        for key in [k for k in cls.suspended if k not in widgets]:
+            del cls.suspended[key]
+
+    @classmethod
+    def show_bar(cls, qtile: Qtile, target: bar.Bar, is_show: bool):
+        if target.is_show() != is_show:
+            target.show(is_show)
+            cls.refresh(qtile)
+
+    @classmethod
+    def check_display(cls, qtile: Qtile):
+        display_on = cls.query_display_on(qtile)
+        if display_on != cls.display_on:
+            logger.info("Display powered %s.", "on" if display_on else "off")
+            cls.display_on = display_on
+            cls.refresh(qtile)
+        qtile.call_later(cls.dpms_check_sec, cls.check_display, qtile)
+
+    @classmethod
+    def setup_hooks(cls):
+        @hook.subscribe.startup_complete
+        def start_checking():
+            assert isinstance(qtile, Qtile)
+            cls.refresh(qtile)
+            qtile.call_later(cls.dpms_check_sec, cls.check_display, qtile)
+
+        @hook.subscribe.screens_reconfigured
+        def on_screens_reconfigured():
+            assert isinstance(qtile, Qtile)
+            cls.refresh(qtile)
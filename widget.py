@@ -11,52 +11,172 @@
 Contains simple custom widgets used in the status bar.
 """
 
-from typing import List
+import abc
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
 
 import iwlib
 import netifaces
-import psutil
 from libqtile.log_utils import logger
-from libqtile.widget.base import ORIENTATION_HORIZONTAL, InLoopPollText
-from libqtile.widget.memory import Memory
+from libqtile.widget import Clock
+from libqtile.widget.base import ORIENTATION_HORIZONTAL, InLoopPollText, _TextBox
+
+from netlink import NetlinkMonitor
+from offloop import OffloopPoll
+from procfs import format_rate
+from sampler import Snapshot, SystemSampler
+from status import Status
 
 
 # --------------------------------------------------------------------
-# pylint: disable=R0901
-# (too many ancestors)
-class CustomMemory(Memory):
+class SampledText(_TextBox):
+    """
+    Base class for text widgets fed by the shared `sampler.SystemSampler`
+    instead of polling on their own timers.
+
+    Samples go through `_TextBox.update`, which already skips unchanged
+    text and only re-lays out the bar when the widget's width changes.
+    """
+
+    orientations = ORIENTATION_HORIZONTAL
+
+    def __init__(self, **config):
+        super().__init__("", **config)
+        self.suspended = False
+
+    def timer_setup(self):
+        SystemSampler.subscribe(self.on_sample)
+
+    def finalize(self):
+        SystemSampler.unsubscribe(self.on_sample)
+        super().finalize()
+
+    def suspend(self):
+        self.suspended = True
+        SystemSampler.unsubscribe(self.on_sample)
+
+    def resume(self):
+        self.suspended = False
+        SystemSampler.subscribe(self.on_sample)
+
+    def on_sample(self, snapshot: Snapshot):
+        self.update(self.format_sample(snapshot))
+
+    @abc.abstractmethod
+    def format_sample(self, snapshot: Snapshot) -> str:
+        pass
+
+
+# --------------------------------------------------------------------
+class CustomMemory(SampledText):
     defaults = [
         ("format", "#{MemPercent:02.0f}% ", "Formatting for field names."),
-        ("update_interval", 1.0, "Update interval for the Memory"),
     ]
 
     def __init__(self, **config):
         super().__init__(**config)
         self.add_defaults(CustomMemory.defaults)
 
-    def poll(self):
-        mem = psutil.virtual_memory()
-        val = {}
-        val["MemPercent"] = (mem.used / mem.total) * 100
-        return self.format.format(**val)
+    def format_sample(self, snapshot: Snapshot) -> str:
+        return self.format.format(MemPercent=snapshot.mem_percent)
 
 
 # --------------------------------------------------------------------
-class CustomNetwork(InLoopPollText):
+class CustomCPU(SampledText):
+    defaults = [
+        ("format", "@{load_percent:02.0f}% ", "Formatting for field names."),
+    ]
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.add_defaults(CustomCPU.defaults)
+
+    def _configure(self, qtile, bar):
+        super()._configure(qtile, bar)
+        SystemSampler.prime_cpu()
+
+    def format_sample(self, snapshot: Snapshot) -> str:
+        if snapshot.cpu_percent is None:
+            return self.text
+        return self.format.format(load_percent=snapshot.cpu_percent)
+
+
+# --------------------------------------------------------------------
+class CustomBattery(SampledText):
+    """
+    Displays the charge of one of the system batteries, by index.
+    """
+
+    defaults = [
+        ("battery", 0, "The index of the battery to display."),
+        ("format", "{char}{percent:2.0%}", "Formatting for field names."),
+        ("charge_char", "^", "Character shown while charging."),
+        ("discharge_char", "V", "Character shown while discharging."),
+        ("full_char", "=", "Character shown when fully charged."),
+        ("empty_char", "x", "Character shown when empty."),
+        ("not_charging_char", "*", "Character shown when plugged in but not charging."),
+        ("unknown_char", "?", "Character shown when the status is unknown."),
+        ("show_short_text", True, "Show only the short text when full or empty."),
+        ("full_short_text", "Full", "Short text shown when fully charged."),
+        ("empty_short_text", "Empty", "Short text shown when empty."),
+    ]
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.add_defaults(CustomBattery.defaults)
+
+    def get_char(self, status: str, percent: float) -> str:
+        if percent <= 0:
+            return self.empty_char
+        return {
+            "Charging": self.charge_char,
+            "Discharging": self.discharge_char,
+            "Full": self.full_char,
+            "Not charging": self.not_charging_char,
+        }.get(status, self.unknown_char)
+
+    def format_sample(self, snapshot: Snapshot) -> str:
+        if self.battery >= len(snapshot.batteries):
+            return ""
+        state = snapshot.batteries[self.battery]
+        if self.show_short_text:
+            if state.status == "Full":
+                return self.full_short_text
+            if state.percent <= 0:
+                return self.empty_short_text
+        return self.format.format(
+            char=self.get_char(state.status, state.percent),
+            percent=state.percent,
+        )
+
+
+# --------------------------------------------------------------------
+class CustomNetwork(SampledText):
     """
     Displays active wifi and ethernet connections.  Wifi connections
     are paired with essid and connection quality.
 
+    Addresses are rebuilt on rtnetlink link and address events when
+    available, otherwise on every sample.  Wifi essid and quality are
+    refreshed on their own, slower schedule.  Receive and transmit rates
+    are available to the formats as `{rx}` and `{tx}`, and are taken from
+    the shared system sampler.
+
+    Interface queries run off the event loop, so a slow ioctl only delays
+    the widget's own text rather than window management.
+
     Uses iwlib and netifaces.
     """
 
-    orientations = ORIENTATION_HORIZONTAL
     defaults = [
-        ("update_interval", 1, "The update interval."),
-        ("eth_format", "{iface}:{addresses}", "The format for ethernet ifaces."),
+        ("wifi_update_interval", 10, "The update interval for wifi essid and quality."),
+        ("use_netlink", True, "Rebuild addresses on rtnetlink events instead of polling."),
+        ("poll_timeout", 2.0, "Seconds to wait for interface queries before giving up."),
+        ("eth_format", "{iface}:{addresses} {rx}↓{tx}↑", "The format for ethernet ifaces."),
         (
             "wifi_format",
-            "{iface}:{addresses}/{essid}",
+            "{iface}:{addresses}/{essid} {rx}↓{tx}↑",
             "The format for wifi ifaces",
         ),
     ]
@@ -64,6 +184,37 @@ class CustomNetwork(InLoopPollText):
     def __init__(self, **config):
         super().__init__(**config)
         self.add_defaults(CustomNetwork.defaults)
+        self.monitor: Optional[NetlinkMonitor] = None
+        self.addresses: Optional[Dict[str, List[str]]] = None
+        self.wifi: Dict[str, Optional[dict]] = {}
+        self.wifi_ttl = 0.0
+        self.rates: Dict[str, Tuple[float, float]] = {}
+        self.events = 0
+        self.queried_events = -1
+        self.poller = OffloopPoll(self.name, self.poll_timeout)
+
+    async def _config_async(self):
+        if not self.use_netlink or self.monitor is not None:
+            return
+        try:
+            self.monitor = NetlinkMonitor(self.on_netlink_event)
+            self.monitor.start(asyncio.get_running_loop())
+        except OSError:
+            logger.exception("CustomNetwork can't use netlink, falling back to polling.")
+            self.monitor = None
+
+    def finalize(self):
+        if self.monitor is not None:
+            self.monitor.stop(asyncio.get_event_loop())
+            self.monitor = None
+        super().finalize()
+
+    def on_netlink_event(self):
+        # While suspended, the addresses are rebuilt when the widget
+        # resumes and receives its next sample.
+        self.events += 1
+        if not self.suspended:
+            self.refresh()
 
     @classmethod
     def get_addresses(cls, iface: str) -> List[str]:
@@ -73,69 +224,242 @@ class CustomNetwork(InLoopPollText):
             return [addr["addr"] for addr in ifaddrs[netifaces.AF_INET]]
         return []
 
-    def format_wifi(self, statuses: List[str], iface: str):
-        interface = iwlib.get_iwconfig(iface)
-        if "stats" not in interface:
+    @classmethod
+    def is_wifi(cls, iface: str) -> bool:
+        return iface.startswith("wl")
+
+    @classmethod
+    def is_eth(cls, iface: str) -> bool:
+        return iface.startswith("en") or iface.startswith("eth")
+
+    @classmethod
+    def query_addresses(cls) -> Dict[str, List[str]]:
+        # pylint: disable=I1101
+        return {
+            iface: cls.get_addresses(iface)
+            for iface in netifaces.interfaces()
+            if cls.is_wifi(iface) or cls.is_eth(iface)
+        }
+
+    @classmethod
+    def query_wifi(cls, ifaces: List[str]) -> Dict[str, Optional[dict]]:
+        wifi: Dict[str, Optional[dict]] = {}
+        for iface in ifaces:
+            if not cls.is_wifi(iface):
+                continue
+            interface = iwlib.get_iwconfig(iface)
+            if "stats" not in interface:
+                wifi[iface] = None
+                continue
+            wifi[iface] = {
+                "essid": bytes(interface["ESSID"]).decode(),
+                "quality": interface["stats"]["quality"],
+            }
+        return wifi
+
+    def query(self, want_addresses: bool, want_wifi: bool):
+        """
+        Runs off the event loop: query whichever of the addresses and wifi
+        info are due.
+        """
+        addresses = self.query_addresses() if want_addresses else self.addresses or {}
+        if want_wifi or any(i not in self.wifi for i in addresses if self.is_wifi(i)):
+            return addresses, self.query_wifi(list(addresses))
+        return addresses, None
+
+    def refresh(self):
+        """
+        Start a query for stale addresses or wifi info, if one isn't already
+        running.  The last good text is shown in the meantime.
+        """
+        events = self.events
+        want_addresses = self.monitor is None or self.queried_events != events
+        want_wifi = time.monotonic() >= self.wifi_ttl
+        if not (want_addresses or want_wifi):
             return
-        quality = interface["stats"]["quality"]
-        essid = bytes(interface["ESSID"]).decode()
-        addresses = self.get_addresses(iface)
-        if addresses:
+        if self.poller.submit(
+            lambda: self.query(want_addresses, want_wifi),
+            lambda result: self.on_query(events, result),
+        ):
+            if want_wifi:
+                self.wifi_ttl = time.monotonic() + self.wifi_update_interval
+
+    def on_query(self, events: int, result):
+        addresses, wifi = result
+        self.addresses = addresses
+        self.queried_events = events
+        if wifi is not None:
+            self.wifi = wifi
+        self.update(self.format())
+        # Catch up on events which arrived while the query was running.
+        if self.monitor is not None and self.queried_events != self.events:
+            self.refresh()
+
+    def get_rates(self, iface: str) -> Dict[str, str]:
+        rx, tx = self.rates.get(iface, (0.0, 0.0))
+        return {"rx": format_rate(rx), "tx": format_rate(tx)}
+
+    def format_wifi(self, statuses: List[str], iface: str):
+        info = self.wifi.get(iface)
+        addresses = self.addresses.get(iface) if self.addresses else None
+        if info and addresses:
             statuses.append(
                 self.wifi_format.format(
-                    essid=essid,
+                    essid=info["essid"],
+                    quality=info["quality"],
                     iface=iface,
                     addresses=",".join(addresses),
+                    **self.get_rates(iface),
                 )
             )
 
     def format_eth(self, statuses: List[str], iface: str):
-        addresses = self.get_addresses(iface)
+        addresses = self.addresses.get(iface) if self.addresses else None
         if addresses:
             statuses.append(
                 self.eth_format.format(
                     iface=iface,
                     addresses=",".join(addresses),
+                    **self.get_rates(iface),
                 )
             )
 
-    def poll(self):
+    def format(self) -> str:
         statuses: List[str] = []
-        try:
-            # pylint: disable=I1101
-            ifaces = netifaces.interfaces()
-            wifi_ifaces = [iface for iface in ifaces if iface.startswith("wl")]
-            eth_ifaces = [
-                iface
-                for iface in ifaces
-                if iface.startswith("en") or iface.startswith("eth")
-            ]
-
-            for iface in wifi_ifaces:
+        ifaces = self.addresses or {}
+
+        for iface in ifaces:
+            if self.is_wifi(iface):
                 self.format_wifi(statuses, iface)
 
-            for iface in eth_ifaces:
+        for iface in ifaces:
+            if self.is_eth(iface):
                 self.format_eth(statuses, iface)
 
-            return " ".join(statuses)
+        return " ".join(statuses)
+
+    def format_sample(self, snapshot: Snapshot) -> str:
+        self.rates = snapshot.net_rates
+        self.refresh()
+        return self.format()
+
+
+# --------------------------------------------------------------------
+class SuspendablePollMixin:
+    """
+    Lets an `InLoopPollText` widget be suspended while it can't be seen.
+    The widget's timer stops at its next tick instead of polling, and
+    resuming polls immediately, restarting the timer if it had stopped.
+    """
+
+    suspended = False
+    stopped = False
+
+    def timer_setup(self):
+        if self.suspended:
+            self.stopped = True
+            return
+        super().timer_setup()
+
+    def suspend(self):
+        self.suspended = True
+
+    def resume(self):
+        self.suspended = False
+        if self.stopped:
+            self.stopped = False
+            self.timer_setup()
+        else:
+            self.tick()
 
-        except Exception:
-            logger.exception("CustomNetwork is broke!")
+
+# --------------------------------------------------------------------
+class CustomClock(SuspendablePollMixin, Clock):
+    pass
 
 
 # --------------------------------------------------------------------
-class FastGenPollText(InLoopPollText):
-    """A generic text widget that polls using poll function to get the text"""
+class FastGenPollText(SuspendablePollMixin, InLoopPollText):
+    """
+    A generic text widget that polls using poll function to get the text.
+
+    With `executor=True`, the poll function runs off the event loop and
+    the last good text is kept while a poll is late.
+    """
 
     defaults = [
         ("func", None, "Poll Function"),
+        ("executor", False, "Run the poll function off the event loop."),
+        ("poll_timeout", 1.0, "Seconds to wait for a poll before giving up."),
     ]
 
     def __init__(self, **config):
         super().__init__(**config)
-        self.add_defaults(InLoopPollText.defaults)
+        self.add_defaults(FastGenPollText.defaults)
+        self.poller = OffloopPoll(self.name, self.poll_timeout)
 
     def poll(self):
         if not self.func:
             return "You need a poll function"
         return self.func()
+
+    def tick(self):
+        if not self.executor:
+            return super().tick()
+        self.poller.submit(self.poll, self.update)
+
+
+# --------------------------------------------------------------------
+class StatusText(_TextBox):
+    """
+    Displays the `status.Status` ticker.
+
+    Redraws are pushed by `Status.show()`, at most once per frame, and
+    otherwise a single timer is scheduled for the next time the ticker text
+    can change on its own, so the widget doesn't wake up while nothing is
+    happening.
+    """
+
+    orientations = ORIENTATION_HORIZONTAL
+    defaults = [
+        ("idle_animation", False, "Animate the spinner while there are no messages."),
+    ]
+
+    def __init__(self, **config):
+        super().__init__("", **config)
+        self.add_defaults(StatusText.defaults)
+        self.timer = None
+
+    def _configure(self, qtile, bar):
+        super()._configure(qtile, bar)
+        Status.animate_idle = self.idle_animation
+        Status.loop = asyncio.get_event_loop()
+        Status.subscribe(self.refresh)
+
+    def timer_setup(self):
+        self.refresh()
+
+    def refresh(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        self.update(Status.update())
+
+        delay = Status.next_update_sec()
+        if delay is not None:
+            self.timer = self.timeout_add(delay, self.refresh)
+
+    def finalize(self):
+        Status.unsubscribe(self.refresh)
+        super().finalize()
+
+    def suspend(self):
+        Status.unsubscribe(self.refresh)
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def resume(self):
+        Status.subscribe(self.refresh)
+        self.refresh()